@@ -8,16 +8,128 @@ def ensure_preference(sender, instance, created=False, **kwargs):
         Preference.objects.get_or_create(user=instance)
 
 
+def update_standings(sender, pickset, **kwargs):
+    # Picks can only change before their games start, so once scored only a points
+    # change after the gameset's points are set can move the standings
+    if (pickset.correct or pickset.wrong) and pickset.gameset.points:
+        from .models import PickerStanding
+
+        gameset = pickset.gameset
+        PickerStanding.objects.refresh(gameset.league, gameset.season, users=[pickset.user_id])
+
+
+def reset_standings(sender, instance, **kwargs):
+    from .cache import bump_version
+    from .models import PickerStanding
+
+    # Standings for the group are rebuilt on the next roster request
+    PickerStanding.objects.filter(group_id=instance.group_id).delete()
+    bump_version("group", instance.group_id)
+
+
+def game_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+    from .models import GameSet
+
+    for league_id in GameSet.objects.filter(pk=instance.gameset_id).values_list(
+        "league", flat=True
+    ):
+        bump_version("league", league_id)
+
+    bump_version("scores", instance.gameset_id)
+
+
+def gameset_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+
+    bump_version("seasons", instance.league_id)
+    bump_version("gameset", instance.id)
+
+
+def pickset_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+
+    bump_version("gameset", instance.gameset_id)
+
+
+def gamepick_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+    from .models import PickSet
+
+    for gameset_id in PickSet.objects.filter(pk=instance.pick_id).values_list("gameset", flat=True):
+        bump_version("gameset", gameset_id)
+
+
+def game_status_changed(sender, instance, created=False, **kwargs):
+    if not created:
+        from .models import GamePick
+
+        GamePick.objects.update_correctness([instance])
+
+
+def user_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+
+    bump_version("user", instance.user_id)
+
+
+def favorite_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+
+    bump_version("favorites", instance.league_id)
+
+
+def team_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+
+    bump_version("teams", instance.league_id)
+
+
+def alias_changed(sender, instance, **kwargs):
+    from .cache import bump_version
+    from .models import Team
+
+    for league_id in Team.objects.filter(pk=instance.team_id).values_list("league", flat=True):
+        bump_version("teams", league_id)
+
+
 class PickerConfig(AppConfig):
     name = "picker"
     verbose_name = "Django Picker"
 
     def ready(self):
+        from django.db.models.signals import post_save, post_delete
         from .conf import picker_settings
+        from .models import Alias, Game, GamePick, GameSet, GameSetPicks, PickSet, Team
+        from .models import Preference, PickerFavorite, PickerMembership
+
+        post_save.connect(game_changed, sender=Game)
+        post_delete.connect(game_changed, sender=Game)
+        post_save.connect(game_status_changed, sender=Game)
+        post_save.connect(team_changed, sender=Team)
+        post_delete.connect(team_changed, sender=Team)
+        post_save.connect(alias_changed, sender=Alias)
+        post_delete.connect(alias_changed, sender=Alias)
+        # Signals are sent with the proxy model as the sender
+        for model in (GameSet, GameSetPicks):
+            post_save.connect(gameset_changed, sender=model)
+            post_delete.connect(gameset_changed, sender=model)
+
+        post_save.connect(pickset_changed, sender=PickSet)
+        post_delete.connect(pickset_changed, sender=PickSet)
+        post_save.connect(gamepick_changed, sender=GamePick)
+        post_delete.connect(gamepick_changed, sender=GamePick)
+        PickSet.updated_signal.connect(update_standings)
+        post_save.connect(reset_standings, sender=PickerMembership)
+        post_delete.connect(reset_standings, sender=PickerMembership)
+        post_save.connect(favorite_changed, sender=PickerFavorite)
+        post_delete.connect(favorite_changed, sender=PickerFavorite)
+        for model in (Preference, PickerFavorite, PickerMembership):
+            post_save.connect(user_changed, sender=model)
+            post_delete.connect(user_changed, sender=model)
 
         auto_create = picker_settings.get("AUTO_CREATE_PREFERENCES")
         if auto_create:
-            from django.db.models.signals import post_save
             from django.contrib.auth import get_user_model
 
             post_save.connect(ensure_preference, sender=get_user_model())
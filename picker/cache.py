@@ -0,0 +1,74 @@
+"""
+Versioned cache helpers.
+
+Values are cached under keys that embed the current version counter of each scope
+they depend on (e.g. ``("league", 1)``), so bumping a counter invalidates every
+value derived from that scope without having to track the individual keys.
+
+Scopes in use:
+
+* ``("league", id)``: a league's games and results
+* ``("teams", id)``: a league's teams and aliases
+* ``("seasons", id)``: a league's seasons and gameset sequences
+* ``("scores", id)``: a gameset's live scores
+* ``("gameset", id)``: a gameset's picks and their scoring
+* ``("standings", id)``: a league's stored standings
+* ``("group", id)``: a group's memberships
+* ``("favorites", id)``: the favorite teams of a league's users
+* ``("user", id)``: a user's preferences, favorites and memberships
+"""
+
+import time
+
+from django.core.cache import caches
+
+from .conf import get_setting
+
+
+def get_cache():
+    return caches[get_setting("CACHE_ALIAS", "default")]
+
+
+def default_timeout():
+    return get_setting("CACHE_TIMEOUT", 3600)
+
+
+def version_key(scope, pk):
+    return "picker:version:{}:{}".format(scope, pk)
+
+
+def get_version(scope, pk):
+    cache = get_cache()
+    key = version_key(scope, pk)
+    version = cache.get(key)
+    if version is None:
+        # Seed from the clock so that an evicted counter never reuses an old version
+        cache.add(key, time.time_ns() // 1000, None)
+        version = cache.get(key)
+
+    return version
+
+
+def bump_version(scope, pk):
+    try:
+        return get_cache().incr(version_key(scope, pk))
+    except ValueError:
+        return get_version(scope, pk)
+
+
+def versioned_key(name, *scopes):
+    return "picker:{}:{}".format(
+        name,
+        ":".join("{}.{}.{}".format(scope, pk, get_version(scope, pk)) for scope, pk in scopes),
+    )
+
+
+def get_or_set(name, scopes, default, timeout=None):
+    """
+    Return the value cached as ``name`` for the current versions of ``scopes``,
+    calling ``default`` to compute and store it on a miss.
+    """
+    if timeout is None:
+        timeout = default_timeout()
+
+    return get_cache().get_or_set(versioned_key(name, *scopes), default, timeout)
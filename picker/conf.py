@@ -10,6 +10,10 @@ DEFAULT_PICKER_SETTINGS = {
     "AUTO_CREATE_PREFERENCES": True,
     "PARTICIPATION_HOOKS": [],
     "TEAM_PICKER_WIDGET": None,
+    "CACHE_ALIAS": "default",
+    "CACHE_TIMEOUT": 3600,
+    "CACHE_VIEWS": True,
+    "CONTEXT_CACHE_TIMEOUT": 60,
     "_BASE": {
         "CURRENT_SEASON": None,
         "FORCE_AUTOPICK": True,
@@ -19,6 +23,13 @@ DEFAULT_PICKER_SETTINGS = {
         "ALLOW_TIES": False,
         "SHOW_TV": True,
         "GAMESET_DURATION": {"days": 7, "seconds": -1},
+        "SCORE_FEEDS": [],
+        "POLL_INTERVAL": 60,
+        "POLL_MAX_BACKOFF": 900,
+        "RESULTS_WEBHOOK_TOKEN": None,
+        "RESULTS_COALESCE_WINDOW": 5,
+        "STANDINGS_PAGE_SIZE": 100,
+        "STANDINGS_MAX_PAGE_SIZE": 500,
     },
 }
 
@@ -0,0 +1,238 @@
+"""
+Score feeds and the asyncio poller that feeds their results into
+``GameSetPicks.update_results``.
+
+Feeds are configured per league in the ``PICKER`` settings, for example::
+
+    PICKER = {
+        "NFL": {
+            "SCORE_FEEDS": [
+                {
+                    "BACKEND": "picker.feeds.HttpFeed",
+                    "OPTIONS": {"url": "https://example.com/{league}/{season}/{sequence}.json"},
+                },
+            ],
+            "POLL_INTERVAL": 60,
+        },
+    }
+
+A league is only polled while one of its gamesets is open and has a game underway or
+awaiting its result; otherwise the poller sleeps until the next game starts. Each poll
+also runs any overdue rescoring deferred by the results webhook.
+"""
+
+import abc
+import json
+import asyncio
+import logging
+from datetime import timedelta
+from urllib.request import urlopen
+
+from asgiref.sync import async_to_sync, sync_to_async
+from django.db.models import Q, Min
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+class ScoreFeed(abc.ABC):
+    """
+    Base feed adapter. ``fetch`` returns a dict in the ``update_results`` schema for
+    ``gameset``, or ``None`` if the feed has nothing for it.
+    """
+
+    def __init__(self, league, **options):
+        self.league = league
+        self.options = options
+
+    def __str__(self):
+        return "{}({})".format(self.__class__.__name__, self.league.abbr)
+
+    def location(self, template, gameset):
+        return template.format(
+            league=self.league.slug,
+            abbr=self.league.abbr,
+            season=gameset.season,
+            sequence=gameset.sequence,
+        )
+
+    @abc.abstractmethod
+    def fetch(self, gameset):
+        pass
+
+
+class FileFeed(ScoreFeed):
+    """
+    Reads results from a local JSON file; ``path`` may use the ``{league}``, ``{abbr}``,
+    ``{season}`` and ``{sequence}`` placeholders.
+    """
+
+    def fetch(self, gameset):
+        try:
+            with open(self.location(self.options["path"], gameset)) as fin:
+                return json.load(fin)
+        except FileNotFoundError:
+            return None
+
+
+class HttpFeed(ScoreFeed):
+    """
+    Fetches results as JSON over HTTP; ``url`` takes the same placeholders as ``FileFeed``.
+    """
+
+    def fetch(self, gameset):
+        url = self.location(self.options["url"], gameset)
+        with urlopen(url, timeout=self.options.get("timeout", 10)) as resp:
+            return json.load(resp)
+
+
+def get_feeds(league):
+    return [
+        import_string(item["BACKEND"])(league, **item.get("OPTIONS", {}))
+        for item in league.config("SCORE_FEEDS", [])
+    ]
+
+
+def merge_results(gameset, results):
+    """
+    Combine the results of several feeds for ``gameset`` into one ``update_results``
+    payload; the first feed to report a game wins. Games are matched on their home
+    team, so feeds that name the same team differently still agree.
+    """
+    teams = gameset.league.team_dict
+    games = {}
+    for result in results:
+        if result and result["season"] == gameset.season and result["sequence"] == gameset.sequence:
+            for game in result["games"]:
+                home = teams.get(game["home"])
+                games.setdefault(home.id if home else game["home"], game)
+
+    if games:
+        return {
+            "season": gameset.season,
+            "sequence": gameset.sequence,
+            "games": list(games.values()),
+        }
+
+
+def active_gamesets(league, now=None):
+    """
+    Return the open gamesets of ``league`` that have a game in progress, or a started
+    game still awaiting its result.
+    """
+    from .models import Game, GameSetPicks
+
+    now = now or timezone.now()
+    started = Q(games__start_time__lte=now)
+    pending = Q(games__status=Game.Status.UNPLAYED) | Q(
+        games__start_time__gte=now - timedelta(minutes=league.avg_game_duration)
+    )
+    return list(
+        GameSetPicks.objects.filter(league=league, opens__lte=now, closes__gte=now)
+        .filter(started & pending)
+        .select_related("league")
+        .distinct()
+    )
+
+
+def next_start(league, now=None):
+    from .models import Game
+
+    now = now or timezone.now()
+    return Game.objects.filter(gameset__league=league, start_time__gt=now).aggregate(
+        start=Min("start_time")
+    )["start"]
+
+
+class ScorePoller:
+    """
+    Polls the feeds of each league concurrently. Every league runs in its own task with
+    its own ``POLL_INTERVAL``; failed polls back off exponentially up to ``POLL_MAX_BACKOFF``.
+    """
+
+    def __init__(self, leagues, once=False, stdout=None):
+        self.leagues = leagues
+        self.once = once
+        self.stdout = stdout
+
+    def log(self, msg, *args):
+        logger.info(msg, *args)
+        if self.stdout:
+            self.stdout.write((msg % args) + "\n")
+
+    def run(self):
+        return async_to_sync(self.poll_all)()
+
+    async def poll_all(self):
+        return await asyncio.gather(*[self.poll_league(league) for league in self.leagues])
+
+    async def poll_league(self, league):
+        feeds = get_feeds(league)
+        interval = league.config("POLL_INTERVAL", 60)
+        max_backoff = league.config("POLL_MAX_BACKOFF", 900)
+        delay = interval
+        while True:
+            try:
+                updates = await self.poll(league, feeds)
+            except Exception:
+                logger.exception("Polling %s failed", league)
+                updates = None
+                delay = min(delay * 2, max_backoff)
+            else:
+                delay = interval
+
+            if self.once:
+                return updates
+
+            if updates is None and delay == interval:
+                delay = await sync_to_async(self.idle_delay)(league, interval, max_backoff)
+
+            await asyncio.sleep(delay)
+
+    def idle_delay(self, league, interval, max_backoff):
+        # Nothing is in progress, so sleep until the next game starts (within reason)
+        now = timezone.now()
+        start = next_start(league, now)
+        if start is None:
+            return max_backoff
+
+        return min(max(interval, (start - now).total_seconds()), max_backoff)
+
+    async def poll(self, league, feeds):
+        """
+        Fetch every active gameset of ``league`` from all ``feeds`` at once and apply the
+        merged results. Returns a list of ``(gameset, update_results(...))`` pairs, or
+        ``None`` when the league is outside of an active window.
+        """
+        from .models import GameSetPicks
+
+        # Also run any deferred rescoring whose timer was lost with its process
+        await sync_to_async(GameSetPicks.objects.rescore_pending)(league=league)
+        gamesets = await sync_to_async(active_gamesets)(league)
+        if not gamesets:
+            return None
+
+        updates = []
+        for gameset in gamesets:
+            fetched = await asyncio.gather(
+                *[asyncio.to_thread(feed.fetch, gameset) for feed in feeds],
+                return_exceptions=True,
+            )
+            reported = []
+            for feed, item in zip(feeds, fetched):
+                if isinstance(item, Exception):
+                    logger.warning("%s failed for %s: %s", feed, gameset, item)
+                else:
+                    reported.append(item)
+
+            if feeds and not reported:
+                raise fetched[0]
+
+            results = merge_results(gameset, reported)
+            if results:
+                updated = await sync_to_async(gameset.update_results)(results)
+                self.log("Updated %s %s: %s games final", league.abbr, gameset, updated[0])
+                updates.append((gameset, updated))
+
+        return updates
@@ -100,7 +100,9 @@ class ManagementPickForm(BasePickForm):
     def save(self):
         gameset = self.gameset
         data = self.cleaned_data.copy()
-        gameset.points = data.pop("points", 0) or 0
+        points = data.pop("points", 0) or 0
+        points_changed = points != gameset.points
+        gameset.points = points
         gameset.save()
 
         for key, winner in data.items():
@@ -109,7 +111,7 @@ class ManagementPickForm(BasePickForm):
                 game = gameset.games.get(pk=pk)
                 game.winner = None if winner == picker.TIE_KEY else int(winner)
 
-        gameset.update_pick_status()
+        gameset.update_pick_status(points_changed=points_changed)
 
     @staticmethod
     def get_initial_picks(gameset):
@@ -1,7 +1,10 @@
 import warnings
 from datetime import timedelta
 
+from django.db import transaction
 from dateutil.parser import parse as parse_dt
+
+from . import cache
 from .exceptions import PickerConfigurationError
 
 
@@ -19,6 +22,24 @@ def valid_schema(data, expected_schema):
     return data
 
 
+def gameset_window(league, item):
+    opens = item.get("opens")
+    if opens:
+        opens = parse_dt(opens)
+    else:
+        dt = parse_dt(item["games"][0]["start"])
+        opens = dt - timedelta(days=dt.weekday() - 1)
+        opens = opens.replace(hour=12, minute=0)
+
+    closes = item.get("closes")
+    if closes:
+        closes = parse_dt(closes)
+    else:
+        closes = opens + timedelta(**league.config("GAMESET_DURATION", {"days": 7, "seconds": -1}))
+
+    return opens, closes
+
+
 def import_season(cls, data):
     data = valid_schema(data, "season")
     gs = None
@@ -27,22 +48,7 @@ def import_season(cls, data):
     teams = league.team_dict
     gamesets = []
     for sequence, item in enumerate(data["gamesets"], 1):
-        opens = item.get("opens")
-        if opens:
-            opens = parse_dt(opens)
-        else:
-            dt = parse_dt(item["games"][0]["start"])
-            opens = dt - timedelta(days=dt.weekday() - 1)
-            opens = opens.replace(hour=12, minute=0)
-
-        closes = item.get("closes")
-        if closes:
-            closes = parse_dt(closes)
-        else:
-            closes = opens + timedelta(
-                **league.config("GAMESET_DURATION", {"days": 7, "seconds": -1})
-            )
-
+        opens, closes = gameset_window(league, item)
         gs, is_new = league.gamesets.get_or_create(
             season=season,
             sequence=item.get("sequence", sequence),
@@ -61,30 +67,183 @@ def import_season(cls, data):
     return gamesets
 
 
-def import_league(cls, data):
-    data = valid_schema(data, "league")
+GAME_IMPORT_FIELDS = ("start_time", "description", "tv", "location", "notes")
+
+
+def bulk_import_season(cls, data):
+    """
+    Diff-based alternative to ``import_season``.
+
+    The season's existing gamesets, games and byes are loaded up front, compared in
+    memory with ``data``, and only the differences are written, with ``bulk_create``
+    and ``bulk_update``, in a single transaction. Returns a dict that maps
+    ``"gamesets"`` and ``"games"`` to the ``"created"``, ``"updated"`` and
+    ``"unchanged"`` objects.
+    """
+    from .models import Game
+
+    data = valid_schema(data, "season")
+    league = cls.objects.get(abbr=data["league"])
+    season = data["season"]
+    teams = league.team_dict
+    GameSet = league.gamesets.model
+    ByeTeam = GameSet.byes.through
+    report = {
+        "gamesets": {"created": [], "updated": [], "unchanged": []},
+        "games": {"created": [], "updated": [], "unchanged": []},
+    }
+
+    with transaction.atomic():
+        existing = {gs.sequence: gs for gs in league.gamesets.filter(season=season)}
+        new_gamesets = []
+        items = []
+        for sequence, item in enumerate(data["gamesets"], 1):
+            sequence = item.get("sequence", sequence)
+            opens, closes = gameset_window(league, item)
+            items.append((sequence, item))
+            gs = existing.get(sequence)
+            if gs is None:
+                gs = GameSet(
+                    league=league, season=season, sequence=sequence, opens=opens, closes=closes
+                )
+                new_gamesets.append(gs)
+            elif gs.opens != opens or gs.closes != closes:
+                gs.opens = opens
+                gs.closes = closes
+                report["gamesets"]["updated"].append(gs)
+            else:
+                report["gamesets"]["unchanged"].append(gs)
+
+        if new_gamesets:
+            GameSet.objects.bulk_create(new_gamesets)
+            existing.update(
+                (gs.sequence, gs)
+                for gs in league.gamesets.filter(
+                    season=season, sequence__in=[gs.sequence for gs in new_gamesets]
+                )
+            )
+            report["gamesets"]["created"] = [existing[gs.sequence] for gs in new_gamesets]
+
+        GameSet.objects.bulk_update(report["gamesets"]["updated"], ["opens", "closes"])
+
+        gamesets = list(existing.values())
+        games = {
+            (game.gameset_id, game.home_id, game.away_id): game
+            for game in Game.objects.filter(gameset__in=gamesets).order_by()
+        }
+        byes = {}
+        for pk, gameset_id, team_id in ByeTeam.objects.filter(gameset__in=gamesets).values_list(
+            "id", "gameset", "team"
+        ):
+            byes.setdefault(gameset_id, {})[team_id] = pk
+
+        new_byes = []
+        stale_byes = []
+        for sequence, item in items:
+            gs = existing[sequence]
+            if "byes" in item:
+                current = byes.get(gs.id, {})
+                wanted = {teams[abbr].id for abbr in item["byes"]}
+                new_byes.extend(
+                    ByeTeam(gameset_id=gs.id, team_id=team_id)
+                    for team_id in wanted
+                    if team_id not in current
+                )
+                stale_byes.extend(pk for team_id, pk in current.items() if team_id not in wanted)
+
+            for dct in item["games"]:
+                home, away = teams.get(dct["home"]), teams.get(dct["away"])
+                values = {
+                    "start_time": parse_dt(dct["start"]),
+                    "description": dct.get("description"),
+                    "tv": dct.get("tv"),
+                    "location": dct.get("location"),
+                    "notes": dct.get("notes"),
+                }
+                game = games.get((gs.id, home and home.id, away and away.id))
+                if game is None:
+                    game = Game(
+                        gameset=gs,
+                        home=home,
+                        away=away,
+                        **{key: value for key, value in values.items() if value is not None},
+                    )
+                    report["games"]["created"].append(game)
+                    continue
+
+                changed = False
+                for key, value in values.items():
+                    if value is not None and getattr(game, key) != value:
+                        setattr(game, key, value)
+                        changed = True
+
+                report["games"]["updated" if changed else "unchanged"].append(game)
+
+        Game.objects.bulk_create(report["games"]["created"])
+        Game.objects.bulk_update(report["games"]["updated"], GAME_IMPORT_FIELDS)
+        ByeTeam.objects.bulk_create(new_byes)
+        if stale_byes:
+            ByeTeam.objects.filter(id__in=stale_byes).delete()
+
+    if new_gamesets:
+        cache.bump_version("seasons", league.id)
+
+    # bulk_create and bulk_update skip the post_save receivers that normally do this
+    for gs in report["gamesets"]["updated"]:
+        cache.bump_version("gameset", gs.id)
+
+    for gameset_id in {
+        game.gameset_id for game in report["games"]["created"] + report["games"]["updated"]
+    }:
+        cache.bump_version("scores", gameset_id)
+
+    if new_gamesets or report["games"]["created"] or report["games"]["updated"]:
+        cache.bump_version("league", league.id)
+
+    return report
+
+
+def get_or_create_league(cls, data):
     name = data["name"]
     default_abbr = "".join(c[0] for c in name.upper().split())
     abbr = data.get("abbr", default_abbr).upper()
-    league, created_league = cls.objects.get_or_create(
+    return cls.objects.get_or_create(
         name=name,
         abbr=abbr,
         slug=abbr.lower(),
         defaults={"current_season": data.get("current_season")},
     )
+
+
+def team_subdivisions(tm):
+    """
+    Return the ``(conf_name, conf_abbr, div_name)`` of a team import item, any of
+    which can be ``None``.
+    """
+    conf_name = conf_abbr = div_name = None
+    if "sub" in tm and len(tm["sub"]):
+        conf_abbr = conf_name = tm["sub"][0]
+        if not isinstance(conf_name, str):
+            conf_name, conf_abbr = conf_name
+
+        conf_abbr = "-".join(conf_abbr.lower().split())
+        if len(tm["sub"]) > 1:
+            div_name = tm["sub"][1]
+
+    return conf_name, conf_abbr, div_name
+
+
+def import_league(cls, data):
+    data = valid_schema(data, "league")
+    league, created_league = get_or_create_league(cls, data)
     confs = {}
     divs = {}
     teams = {}
     teams_results = []
     for tm in data["teams"]:
         conf = div = None
-        if "sub" in tm and len(tm["sub"]):
-            conf_abbr = conf_name = tm["sub"][0]
-            if not isinstance(conf_name, str):
-                conf_name, conf_abbr = conf_name
-
-            conf_abbr = "-".join(conf_abbr.lower().split())
-
+        conf_name, conf_abbr, div_name = team_subdivisions(tm)
+        if conf_name:
             if conf_name in confs:
                 conf = confs[conf_name]
             else:
@@ -94,8 +253,7 @@ def import_league(cls, data):
                 )
                 confs[conf_name] = conf
 
-            if len(tm["sub"]) > 1:
-                div_name = tm["sub"][1]
+            if div_name:
                 if (div_name, conf_name) in divs:
                     div = divs[(div_name, conf_name)]
                 else:
@@ -131,3 +289,107 @@ def import_league(cls, data):
             teams[key].aliases.get_or_create(name=name)
 
     return [[league, created_league], teams_results]
+
+
+def bulk_import_league(cls, data):
+    """
+    Bulk alternative to ``import_league``.
+
+    The league's existing conferences, divisions, teams and aliases are loaded up
+    front and only the missing ones are created, in batches, in a single transaction.
+    Returns the same ``[[league, created], teams_results]`` structure.
+    """
+    from .models import Alias, Conference, Division, Team
+
+    data = valid_schema(data, "league")
+    with transaction.atomic():
+        league, created_league = get_or_create_league(cls, data)
+        confs = {conf.name: conf for conf in league.conferences.all()}
+        divs = {
+            (div.name, div.conference.name): div
+            for div in Division.objects.filter(conference__league=league).select_related(
+                "conference"
+            )
+        }
+        teams = {(team.name, team.abbr): team for team in league.teams.all()}
+        aliases = set(Alias.objects.filter(team__league=league).values_list("team", "name"))
+
+        items = [(tm, team_subdivisions(tm)) for tm in data["teams"]]
+        new_confs = {}
+        for tm, (conf_name, conf_abbr, div_name) in items:
+            if conf_name and conf_name not in confs and conf_name not in new_confs:
+                new_confs[conf_name] = Conference(name=conf_name, abbr=conf_abbr, league=league)
+
+        if new_confs:
+            Conference.objects.bulk_create(new_confs.values())
+            confs.update(
+                (conf.name, conf) for conf in league.conferences.filter(name__in=new_confs)
+            )
+
+        new_divs = {}
+        for tm, (conf_name, conf_abbr, div_name) in items:
+            key = (div_name, conf_name)
+            if conf_name and div_name and key not in divs and key not in new_divs:
+                new_divs[key] = Division(name=div_name, conference=confs[conf_name])
+
+        if new_divs:
+            Division.objects.bulk_create(new_divs.values())
+            divs.update(
+                ((div.name, div.conference.name), div)
+                for div in Division.objects.filter(
+                    conference__league=league, name__in={name for name, conf in new_divs}
+                ).select_related("conference")
+            )
+
+        new_teams = {}
+        for tm, (conf_name, conf_abbr, div_name) in items:
+            key = (tm["name"], tm["abbr"])
+            if key not in teams and key not in new_teams:
+                new_teams[key] = Team(
+                    league=league,
+                    name=tm["name"],
+                    abbr=tm["abbr"],
+                    nickname=tm.get("nickname", ""),
+                    colors=",".join(tm.get("colors", [])),
+                    conference=confs.get(conf_name),
+                    division=divs.get((div_name, conf_name)),
+                    logo=tm.get("logo", ""),
+                    location=tm.get("location", ""),
+                )
+
+        if new_teams:
+            Team.objects.bulk_create(new_teams.values())
+            teams.update(
+                ((team.name, team.abbr), team)
+                for team in league.teams.filter(abbr__in={abbr for name, abbr in new_teams})
+            )
+
+        by_abbr = {}
+        teams_results = []
+        wanted_aliases = []
+        for tm, subs in items:
+            key = (tm["name"], tm["abbr"])
+            team = by_abbr[tm["abbr"]] = teams[key]
+            teams_results.append([team, key in new_teams])
+            wanted_aliases.extend((team, alias) for alias in tm.get("aliases", []))
+
+        if "aliases" in data:
+            warnings.warn(
+                "aliases should be set on the team",
+                DeprecationWarning,
+                stacklevel=2,
+            )
+            wanted_aliases.extend((by_abbr[key], name) for name, key in data["aliases"].items())
+
+        new_aliases = []
+        for team, name in wanted_aliases:
+            if (team.id, name) not in aliases:
+                aliases.add((team.id, name))
+                new_aliases.append(Alias(team=team, name=name))
+
+        Alias.objects.bulk_create(new_aliases)
+
+    if new_teams or new_aliases:
+        cache.bump_version("teams", league.id)
+
+    return [[league, created_league], teams_results]
@@ -0,0 +1,38 @@
+from django.core.management.base import BaseCommand, CommandError
+from picker import models as picker
+
+
+class Command(BaseCommand):
+    help = "Autopick for every league member without a complete set of picks"
+    requires_migrations_checks = True
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", help="League abbreviation, defaults to DEFAULT_LEAGUE")
+        parser.add_argument("--season", type=int, help="Defaults to the current gameset's")
+        parser.add_argument("--sequence", type=int, help="Defaults to the current gameset's")
+        parser.add_argument(
+            "--strategy",
+            choices=[s for s in picker.PickSet.Strategy.values if s != "USER"],
+            default=picker.PickSet.Strategy.RANDOM,
+        )
+
+    def handle(self, *args, **options):
+        league = picker.League.get(options["league"])
+        if options["sequence"]:
+            season = options["season"] or league.current_season
+            try:
+                gameset = picker.GameSetPicks.objects.get(
+                    league=league, season=season, sequence=options["sequence"]
+                )
+            except picker.GameSetPicks.DoesNotExist:
+                raise CommandError("No gameset {} for {}".format(options["sequence"], season))
+        else:
+            gameset = picker.GameSetPicks.objects.current_gameset(league)
+            if gameset is None:
+                raise CommandError("No current gameset for {}".format(league))
+
+        created, completed = picker.PickSet.objects.autopick(gameset, options["strategy"])
+        self.stdout.write(
+            "Autopicked gameset {}: {} new, {} completed\n".format(gameset, created, completed)
+        )
@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from picker import models as picker
+
+
+class Command(BaseCommand):
+    help = "Backfill the stored correctness of picks from their games' results"
+    requires_migrations_checks = True
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", help="League abbreviation, defaults to all leagues")
+        parser.add_argument("--season", type=int, help="Defaults to all seasons")
+
+    def handle(self, *args, **options):
+        gamesets = picker.GameSet.objects.all()
+        if options["league"]:
+            gamesets = gamesets.filter(league=picker.League.get(options["league"]))
+
+        if options["season"]:
+            gamesets = gamesets.filter(season=options["season"])
+
+        total = 0
+        for gameset in gamesets.order_by("league", "season", "sequence"):
+            # One UPDATE per gameset keeps the statements (and locks) small
+            total += picker.GamePick.objects.update_correctness(gameset.games.order_by())
+
+        self.stdout.write("Updated {} picks in {} gamesets\n".format(total, gamesets.count()))
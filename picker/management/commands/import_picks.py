@@ -10,24 +10,35 @@ class Command(BaseCommand):
 
     def add_arguments(self, parser):
         parser.add_argument("filenames", nargs="+")
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Diff against the existing data and write only the changes in bulk",
+        )
 
     def handle(self, *args, **options):
         for arg in options["filenames"]:
             with open(arg) as fin:
                 data = json.loads(fin.read())
 
-            schema = data["schema"]
-            if schema == "complete" or schema == "league":
-                league_info, teams_info = picker.League.import_league(data)
-                self.stdout.write(
-                    "{} league {}\n".format(
-                        "Created" if league_info[1] else "Updated", league_info[0]
-                    )
-                )
-                for t, created in teams_info:
-                    self.stdout.write("{} team {}\n".format("Created" if created else "Updated", t))
+            # A bundle is a list of league, season or complete documents
+            for item in data if isinstance(data, list) else [data]:
+                self.import_data(item, options["bulk"])
+
+    def import_data(self, data, bulk=False):
+        schema = data["schema"]
+        if schema == "complete" or schema == "league":
+            league_info, teams_info = picker.League.import_league(data, bulk=bulk)
+            self.stdout.write(
+                "{} league {}\n".format("Created" if league_info[1] else "Updated", league_info[0])
+            )
+            for t, created in teams_info:
+                self.stdout.write("{} team {}\n".format("Created" if created else "Updated", t))
 
-            if schema == "complete" or schema == "season":
+        if schema == "complete" or schema == "season":
+            if bulk:
+                self.report_changes(picker.League.import_season(data, bulk=True))
+            else:
                 results = picker.League.import_season(data)
                 count = len(results)
                 created = sum(1 for r in results if r[1])
@@ -36,3 +47,11 @@ class Command(BaseCommand):
                         count, created, count - created
                     )
                 )
+
+    def report_changes(self, report):
+        for kind, changes in report.items():
+            self.stdout.write(
+                "Processed {}: {}\n".format(
+                    kind, ", ".join("{} {}".format(len(v), k) for k, v in changes.items())
+                )
+            )
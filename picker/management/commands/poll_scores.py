@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+from picker import models as picker
+from picker.feeds import ScorePoller
+
+
+class Command(BaseCommand):
+    help = "Poll the configured score feeds and update results while games are in progress"
+    requires_migrations_checks = True
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--league",
+            action="append",
+            dest="leagues",
+            help="League abbreviation, may be repeated; defaults to all active leagues",
+        )
+        parser.add_argument("--once", action="store_true", help="Poll once and exit")
+
+    def handle(self, *args, **options):
+        if options["leagues"]:
+            leagues = [picker.League.get(abbr) for abbr in options["leagues"]]
+            missing = [league.abbr for league in leagues if not league.config("SCORE_FEEDS")]
+            if missing:
+                raise CommandError("No score feeds for {}".format(", ".join(missing)))
+        else:
+            leagues = [lg for lg in picker.League.objects.active() if lg.config("SCORE_FEEDS")]
+
+        if not leagues:
+            raise CommandError("No leagues with score feeds to poll")
+
+        ScorePoller(leagues, once=options["once"], stdout=self.stdout).run()
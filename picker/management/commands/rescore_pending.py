@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+from picker import models as picker
+
+
+class Command(BaseCommand):
+    help = "Run the overdue deferred rescoring of gamesets, such as after a worker restart"
+    requires_migrations_checks = True
+    requires_system_checks = []
+
+    def add_arguments(self, parser):
+        parser.add_argument("--league", help="League abbreviation, defaults to all leagues")
+
+    def handle(self, *args, **options):
+        filters = {}
+        if options["league"]:
+            filters["league"] = picker.League.get(options["league"])
+
+        count = picker.GameSetPicks.objects.rescore_pending(**filters)
+        self.stdout.write("Rescored {} gamesets\n".format(count))
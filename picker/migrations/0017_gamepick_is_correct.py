@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:10
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("picker", "0016_pickerstanding"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gamepick",
+            name="is_correct",
+            field=models.BooleanField(default=None, editable=False, null=True),
+        ),
+    ]
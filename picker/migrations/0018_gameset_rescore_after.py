@@ -0,0 +1,17 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("picker", "0017_gamepick_is_correct"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="gameset",
+            name="rescore_after",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -0,0 +1,24 @@
+from django.db import migrations, models
+
+
+def backfill_correctness(apps, schema_editor):
+    Game = apps.get_model("picker", "Game")
+    GamePick = apps.get_model("picker", "GamePick")
+    for status, side in [("H", "home_id"), ("A", "away_id")]:
+        winner = models.Subquery(Game.objects.filter(pk=models.OuterRef("game_id")).values(side))
+        GamePick.objects.filter(game__status=status).update(
+            is_correct=models.Case(
+                models.When(winner_id=winner, then=models.Value(True)),
+                default=models.Value(False),
+            )
+        )
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("picker", "0018_gameset_rescore_after"),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_correctness, migrations.RunPython.noop),
+    ]
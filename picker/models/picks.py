@@ -1,13 +1,20 @@
-import itertools
+import random
+import threading
+from datetime import timedelta
+from types import SimpleNamespace
+from collections import defaultdict
 
-from django.db import models
+from django.db import models, transaction, close_old_connections
 from django.conf import settings
 from django.utils import timezone
 from django.dispatch import Signal
+from django.db.models.functions import Rank
 
 from . import sports
 from ..exceptions import PickerResultException
+from .. import cache
 from .. import utils
+from .. import stats
 
 __all__ = [
     "Preference",
@@ -17,6 +24,7 @@ __all__ = [
     "PickSet",
     "GamePick",
     "GameSetPicks",
+    "PickerStanding",
 ]
 
 
@@ -146,27 +154,175 @@ class PickerMembership(models.Model):
         return self.status == self.Status.MANAGER
 
 
-class PickSetManager(models.Manager):
+class PickSetQuerySet(models.QuerySet):
+    def ranked(self):
+        """
+        Annotate ``place`` within each gameset: most correct first, then closest to the
+        gameset's points total, with ties sharing a place (``RANK()``). The result can be
+        filtered on ``place`` and sliced like any other queryset.
+        """
+        delta = models.Case(
+            models.When(gameset__points=0, then=models.Value(0)),
+            models.When(
+                points__gte=models.F("gameset__points"),
+                then=models.F("points") - models.F("gameset__points"),
+            ),
+            default=models.F("gameset__points") - models.F("points"),
+        )
+        return self.annotate(
+            delta=delta,
+            place=models.Window(
+                Rank(),
+                partition_by=models.F("gameset"),
+                order_by=[models.F("correct").desc(), models.F("delta").asc()],
+            ),
+        ).order_by("gameset", "place", "id")
+
+
+class PickSetManager(models.Manager.from_queryset(PickSetQuerySet)):
     def for_gameset_user(self, gameset, user, strategy=None, autopick=False):
         Strategy = self.model.Strategy
         strategy = strategy or Strategy.USER
-        picks, created = self.get_or_create(
-            gameset=gameset, user=user, defaults={"strategy": strategy}
-        )
-        if created and autopick:
-            picks.points = gameset.league.random_points()
-            picks.save()
+        with transaction.atomic():
+            picks, created = self.get_or_create(
+                gameset=gameset, user=user, defaults={"strategy": strategy}
+            )
+            if created and autopick:
+                picks.points = gameset.league.random_points()
+                picks.save()
+
+            games = gameset.games.order_by().values_list("id", "status", "home_id", "away_id")
+            if not created:
+                games = games.exclude(gamepicks__pick=picks)
+
+            new_picks = []
+            for game_id, status, *teams in games:
+                winner_id = random.choice(teams) if autopick else None
+                new_picks.append(
+                    GamePick(
+                        pick=picks,
+                        game_id=game_id,
+                        winner_id=winner_id,
+                        is_correct=GamePick.correctness(status, *teams, winner_id),
+                    )
+                )
 
-        games = set(gameset.games.values_list("id", flat=True))
-        if not created:
-            games -= set(picks.gamepicks.values_list("game__id", flat=True))
+            GamePick.objects.bulk_create(new_picks)
 
-        for game in gameset.games.filter(id__in=games).select_related():
-            winner = game.get_random_winner() if autopick else None
-            picks.gamepicks.create(game=game, winner=winner)
+        if new_picks:
+            cache.bump_version("gameset", gameset.id)
 
         return picks
 
+    def autopick(self, gameset, strategy=None):
+        """
+        Autopick for every active member of ``gameset``'s league without a complete
+        PickSet, honoring member preferences unless ``FORCE_AUTOPICK`` is set. Games
+        that have already started are left alone.
+
+        Returns a tuple of the number of PickSets created and the number completed.
+        """
+        Strategy = self.model.Strategy
+        strategy = strategy or Strategy.RANDOM
+        league = gameset.league
+        members = PickerMembership.objects.filter(
+            status=PickerMembership.Status.ACTIVE,
+            group__status=PickerGrouping.Status.ACTIVE,
+            group__leagues=league,
+            user__is_active=True,
+        )
+        if not league.config("FORCE_AUTOPICK"):
+            members = members.exclude(autopick=PickerMembership.Autopick.NONE).exclude(
+                user__picker_preferences__autopick=Preference.Autopick.NONE
+            )
+
+        user_ids = set(members.values_list("user", flat=True))
+        games = list(
+            gameset.games.filter(start_time__gt=timezone.now())
+            .order_by()
+            .values_list("id", "status", "home_id", "away_id")
+        )
+        if not user_ids or not games:
+            return (0, 0)
+
+        if strategy == Strategy.HOME:
+            winners = {game_id: home_id for game_id, status, home_id, away_id in games}
+        elif strategy == Strategy.BEST:
+            points = {
+                team_id: wins * 2 + ties
+                for team_id, (wins, losses, ties) in league.team_records(
+                    gameset.season, before=gameset.sequence
+                ).items()
+            }
+            winners = {
+                game_id: away_id if points.get(away_id, 0) > points.get(home_id, 0) else home_id
+                for game_id, status, home_id, away_id in games
+            }
+        else:
+            winners = None
+
+        def pick_winner(game_id, status, home_id, away_id):
+            return winners[game_id] if winners else random.choice((home_id, away_id))
+
+        with transaction.atomic():
+            picksets = {ps.user_id: ps for ps in self.filter(gameset=gameset, user__in=user_ids)}
+            new_users = user_ids - set(picksets)
+            if new_users:
+                self.bulk_create(
+                    [
+                        self.model(
+                            user_id=user_id,
+                            gameset=gameset,
+                            strategy=strategy,
+                            points=league.random_points(),
+                        )
+                        for user_id in new_users
+                    ]
+                )
+                picksets.update(
+                    {ps.user_id: ps for ps in self.filter(gameset=gameset, user__in=new_users)}
+                )
+
+            picked = {}
+            for gp in GamePick.objects.filter(pick__in=picksets.values()).order_by():
+                picked[(gp.pick_id, gp.game_id)] = gp
+
+            completed = set()
+            new_picks = []
+            unpicked = []
+            for ps in picksets.values():
+                for game in games:
+                    gp = picked.get((ps.id, game[0]))
+                    if gp is None:
+                        gp = GamePick(pick=ps, game_id=game[0])
+                        new_picks.append(gp)
+                    elif gp.winner_id is None:
+                        unpicked.append(gp)
+                    else:
+                        continue
+
+                    gp.winner_id = pick_winner(*game)
+                    gp.is_correct = GamePick.correctness(*game[1:], gp.winner_id)
+                    completed.add(ps)
+
+            GamePick.objects.bulk_create(new_picks)
+            GamePick.objects.bulk_update(unpicked, ["winner", "is_correct"])
+
+            pointless = []
+            for ps in picksets.values():
+                if ps.points == 0:
+                    ps.points = league.random_points()
+                    if ps.points:
+                        pointless.append(ps)
+                        completed.add(ps)
+
+            self.bulk_update(pointless, ["points"])
+
+        if completed:
+            cache.bump_version("gameset", gameset.id)
+
+        return (len(new_users), len(completed) - len(new_users))
+
 
 class PickSet(models.Model):
     class Strategy(models.TextChoices):
@@ -204,11 +360,22 @@ class PickSet(models.Model):
 
     @property
     def is_complete(self):
-        return False if self.points == 0 else (self.progress == self.gameset.games.count())
+        if self.points == 0:
+            return False
+
+        game_count = getattr(self, "game_count", None)
+        if game_count is None:
+            game_count = self.gameset.games.count()
+
+        return self.progress == game_count
 
     @property
     def progress(self):
-        return self.gamepicks.filter(winner__isnull=False).count()
+        picked = getattr(self, "picked_count", None)
+        if picked is None:
+            picked = self.gamepicks.filter(winner__isnull=False).count()
+
+        return picked
 
     def update_status(self, is_winner=False):
         picks = self.gamepicks.all()
@@ -229,22 +396,29 @@ class PickSet(models.Model):
         """
         games can be dict of {game.id: winner_id} for all picked games to update
         """
-        if games:
-            game_dict = {g.id: g for g in self.gameset.games.filter(id__in=games)}
-            game_picks = {pick.game.id: pick for pick in self.gamepicks.filter(game__id__in=games)}
-            for key, winner in games.items():
-                game = game_dict[key]
-                if not game.has_started:
-                    pick = game_picks[key]
-                    pick.winner_id = winner
-                    pick.save()
-
-        if points is not None:
-            self.points = points
-            self.save()
-
-        if games or points:
-            self.updated_signal.send(sender=self.__class__, pickset=self, auto_pick=False)
+        changed = []
+        with transaction.atomic():
+            if games:
+                # Picks for games that have started are locked
+                now = timezone.now()
+                for pick in self.gamepicks.filter(
+                    game__in=games, game__start_time__gt=now
+                ).select_related("game"):
+                    winner_id = int(games[pick.game_id])
+                    if pick.winner_id != winner_id:
+                        pick.winner_id = winner_id
+                        pick.update_correctness()
+                        changed.append(pick)
+
+                if changed:
+                    GamePick.objects.bulk_update(changed, ["winner", "is_correct"])
+
+            if changed or (points is not None and points != self.points):
+                if points is not None:
+                    self.points = points
+
+                self.save(update_fields=["points", "updated"])
+                self.updated_signal.send(sender=self.__class__, pickset=self, auto_pick=False)
 
 
 class GamePickManager(models.Manager):
@@ -257,12 +431,41 @@ class GamePickManager(models.Manager):
     def picked_winner_ids(self):
         return self.filter(winner__isnull=False).values_list("game__id", "winner__id")
 
+    def update_correctness(self, games):
+        """
+        Set ``is_correct`` for every pick of ``games`` from their current status with a
+        single ``UPDATE``. Returns the number of picks updated.
+        """
+        Status = sports.Game.Status
+        whens = []
+        for game in games:
+            winner_id = {Status.HOME_WIN: game.home_id, Status.AWAY_WIN: game.away_id}.get(
+                game.status
+            )
+            if winner_id is None:
+                whens.append(models.When(game_id=game.id, then=models.Value(None)))
+            else:
+                whens.extend(
+                    [
+                        models.When(game_id=game.id, winner_id=winner_id, then=models.Value(True)),
+                        models.When(game_id=game.id, then=models.Value(False)),
+                    ]
+                )
+
+        if not whens:
+            return 0
+
+        return self.filter(game__in=[game.id for game in games]).update(
+            is_correct=models.Case(*whens, output_field=models.BooleanField(null=True))
+        )
+
 
 class GamePick(models.Model):
     game = models.ForeignKey(sports.Game, on_delete=models.CASCADE, related_name="gamepicks")
     winner = models.ForeignKey(sports.Team, on_delete=models.SET_NULL, null=True, blank=True)
     pick = models.ForeignKey(PickSet, on_delete=models.CASCADE, related_name="gamepicks")
     confidence = models.PositiveIntegerField(default=0)
+    is_correct = models.BooleanField(null=True, default=None, editable=False)
 
     objects = GamePickManager()
 
@@ -275,8 +478,13 @@ class GamePick(models.Model):
     def set_random_winner(self, force=False):
         if self.winner is None or force:
             self.winner = self.game.get_random_winner()
+            self.update_correctness()
             self.save()
 
+    def update_correctness(self):
+        game = self.game
+        self.is_correct = self.correctness(game.status, game.home_id, game.away_id, self.winner_id)
+
     @property
     def start_time(self):
         return self.game.start_time
@@ -297,33 +505,108 @@ class GamePick(models.Model):
     def picked_away(self):
         return self.winner == self.game.away
 
-    @property
-    def is_correct(self):
-        winner = self.game.winner
-        if winner:
-            return self.winner == winner
-
-        return None
+    @staticmethod
+    def correctness(status, home_id, away_id, winner_id):
+        """
+        Tri-state correctness of picking ``winner_id``: ``None`` until the game has a
+        winner.
+        """
+        Status = sports.Game.Status
+        game_winner = {Status.HOME_WIN: home_id, Status.AWAY_WIN: away_id}.get(status)
+        return None if game_winner is None else game_winner == winner_id
 
 
-class GameSetPicksManager(models.Manager):
+class GameSetPicksManager(models.Manager.from_queryset(sports.GameSetQuerySet)):
     def current_gameset(self, league):
         rel = timezone.now()
+        gamesets = self.with_bounds().filter(league=league)
         try:
-            return self.get(league=league, opens__lte=rel, closes__gte=rel)
+            return gamesets.get(opens__lte=rel, closes__gte=rel)
         except GameSetPicks.DoesNotExist:
             pass
 
         try:
-            return self.filter(league=league, points=0, opens__gte=rel).earliest("opens")
+            return gamesets.filter(points=0, opens__gte=rel).earliest("opens")
         except GameSetPicks.DoesNotExist:
             pass
 
         try:
-            return self.filter(league=league, closes__lte=rel).latest("closes")
+            return gamesets.filter(closes__lte=rel).latest("closes")
         except sports.GameSet.DoesNotExist:
             return None
 
+    def rescore_pending(self, due=True, **filters):
+        """
+        Run the deferred rescoring of the gamesets matching ``filters`` that have one
+        pending (and, with ``due``, overdue). Each gameset is claimed by clearing its
+        ``rescore_after`` first, so only one process scores it and results arriving
+        meanwhile schedule again. Returns the number of gamesets rescored.
+        """
+        pending = self.filter(rescore_after__isnull=False, **filters)
+        if due:
+            pending = pending.filter(rescore_after__lte=timezone.now())
+
+        count = 0
+        for gameset in pending.select_related("league"):
+            if self.filter(pk=gameset.pk, rescore_after__isnull=False).update(rescore_after=None):
+                gameset.rescore_after = None
+                gameset.update_pick_status()
+                count += 1
+
+        return count
+
+    def season_picks(self, league, season, user):
+        """
+        Return ``(gameset, pickset)`` pairs for ``user`` across ``season`` in a single
+        query. Each gameset is annotated with its bounds and ``game_count``, and each
+        pickset with ``picked_count``, so that ``is_open`` and ``is_complete`` need no
+        further queries. ``pickset`` is ``None`` for gamesets the user has not played.
+        """
+        picksets = PickSet.objects.filter(gameset=models.OuterRef("pk"), user=user)
+        picked = (
+            GamePick.objects.filter(pick__gameset=models.OuterRef("pk"), pick__user=user)
+            .exclude(winner=None)
+            .order_by()
+            .values("pick")
+            .annotate(count=models.Count("id"))
+            .values("count")
+        )
+        gamesets = (
+            self.with_bounds()
+            .filter(league=league, season=season)
+            .annotate(
+                game_count=models.Count("games"),
+                pickset_id=models.Subquery(picksets.values("id")[:1]),
+                pickset_points=models.Subquery(picksets.values("points")[:1]),
+                picked_count=models.Subquery(picked[:1]),
+            )
+        )
+
+        results = []
+        for gs in gamesets:
+            pickset = None
+            if gs.pickset_id:
+                pickset = PickSet.from_db(
+                    gamesets.db,
+                    ["id", "user_id", "gameset_id", "points"],
+                    [gs.pickset_id, user.id, gs.id, gs.pickset_points],
+                )
+                pickset.gameset = gs
+                pickset.game_count = gs.game_count
+                pickset.picked_count = gs.picked_count or 0
+
+            results.append((gs, pickset))
+
+        return results
+
+
+def rescore_gameset(gameset_id):
+    close_old_connections()
+    try:
+        GameSetPicks.objects.rescore_pending(due=False, pk=gameset_id)
+    finally:
+        close_old_connections()
+
 
 class GameSetPicks(sports.GameSet):
     objects = GameSetPicksManager()
@@ -331,14 +614,25 @@ class GameSetPicks(sports.GameSet):
     class Meta:
         proxy = True
 
+    def reset_games_status(self):
+        super().reset_games_status()
+        GamePick.objects.filter(game__gameset=self, is_correct__isnull=False).update(
+            is_correct=None
+        )
+        cache.bump_version("gameset", self.id)
+
     def pick_for_user(self, user):
         try:
             return self.picksets.select_related().get(user=user)
         except models.ObjectDoesNotExist:
             return None
 
-    def update_results(self, results):
+    def update_results(self, results, coalesce=False):
         """
+        Apply ``results`` and rescore the gameset's picks; with ``coalesce`` the
+        rescoring is deferred through ``schedule_rescore`` so that a burst of updates
+        is scored once.
+
         results schema: {'sequence': 1, 'season': 2018, 'games': [{
             "home": "HOME",
             "away": "AWAY",
@@ -355,50 +649,435 @@ class GameSetPicks(sports.GameSet):
         if results["sequence"] != self.sequence or results["season"] != self.season:
             raise PickerResultException("Results not updated, wrong season or week")
 
-        games = sorted(results["games"], key=lambda g: g.get("start"))
-        completed = {g["home"]: g for g in games if g["status"].startswith("F")}
+        Status = sports.Game.Status
+        teams = self.league.team_dict
+        games = sorted(results["games"], key=lambda g: g.get("start") or "")
+        self.update_scores(games)
+        completed = {}
+        for result in games:
+            home = teams.get(result["home"])
+            if home and result["status"].startswith("F"):
+                completed[home.id] = result
+
         if not completed:
             return (0, None)
 
-        count = 0
-        for game in self.games.incomplete(home__abbr__in=completed.keys()):
-            result = completed.get(game.home.abbr, None)
-            if result:
-                winner = result["winner"]
-                game.winner = (
-                    game.home
-                    if game.home.abbr == winner
-                    else game.away
-                    if game.away.abbr == winner
-                    else None
-                )
-                count += 1
-
+        # Games already scored are included so that late corrections are picked up
+        finished = []
+        changes = {}
+        for game in self.games.filter(home__in=completed).order_by():
+            result = completed[game.home_id]
+            winner = teams.get(result["winner"])
+            winner_id = winner.id if winner else None
+            status = (
+                Status.HOME_WIN
+                if winner_id == game.home_id
+                else Status.AWAY_WIN
+                if winner_id == game.away_id
+                else Status.TIE
+            )
+            if status != game.status:
+                changes[game.id] = (game.status, status)
+                game.status = status
+                finished.append(game)
+
+        if finished:
+            sports.Game.objects.bulk_update(finished, ["status"])
+            GamePick.objects.update_correctness(finished)
+            cache.bump_version("league", self.league_id)
+            cache.bump_version("scores", self.id)
+
+        points = self.points
         result_final = games[-1]
         if result_final["status"].startswith("F"):
             result_score = int(result_final["home_score"]) + int(result_final["away_score"])
             last_game = self.last_game
-            if self.points != result_score and last_game.winner:
+            if self.points != result_score and (last_game.is_home_win or last_game.is_away_win):
                 if timezone.now() > last_game.end_time:
                     self.points = result_score
-                    self.save()
+                    self.save(update_fields=["points"])
+
+        if self.points != points:
+            # A new points total can change the winners and deltas of every PickSet; it
+            # arrives once per gameset, so it is never deferred
+            self.update_pick_status(points_changed=True)
+        elif coalesce:
+            if finished:
+                self.schedule_rescore()
+        elif changes:
+            self.rescore_games(changes)
 
-        if count:
+        return (len(finished), self.points)
+
+    def schedule_rescore(self, window=None):
+        """
+        Run ``update_pick_status`` once ``window`` seconds (``RESULTS_COALESCE_WINDOW``
+        by default) after the first request, folding in any requests made meanwhile.
+        The pending rescoring is recorded in ``rescore_after``, so if the timer is lost
+        with its process it is still run by ``GameSetPicksManager.rescore_pending``
+        (from ``poll_scores``, the results webhook or the ``rescore_pending`` command).
+        Returns ``True`` if this call scheduled (or ran) the rescoring.
+        """
+        if window is None:
+            window = self.league.config("RESULTS_COALESCE_WINDOW", 0)
+
+        if window <= 0:
             self.update_pick_status()
+            return True
 
-        return (count, self.points)
+        due = timezone.now() + timedelta(seconds=window)
+        if not GameSetPicks.objects.filter(pk=self.pk, rescore_after__isnull=True).update(
+            rescore_after=due
+        ):
+            return False
+
+        self.rescore_after = due
+        timer = threading.Timer(window, rescore_gameset, [self.id])
+        timer.daemon = True
+        transaction.on_commit(timer.start)
+        return True
 
     def winners(self):
-        if self.points:
-            yield from itertools.takewhile(lambda i: i.place == 1, self.results())
+        if not self.points:
+            return self.picksets.none()
+
+        return self.picksets.ranked().filter(place=1).select_related("user")
+
+    def update_pick_status(self, points_changed=False):
+        """
+        Score all of the gameset's PickSets with a single aggregate query and write back
+        the ones that changed with a single bulk update. With ``points_changed``, the
+        standings of every user in the gameset are refreshed, as their points deltas
+        all changed.
+        """
+        picksets = self.picksets.annotate(
+            num_picks=models.Count("gamepicks"),
+            num_correct=models.Count("gamepicks", filter=models.Q(gamepicks__is_correct=True)),
+        )
 
-    def update_pick_status(self):
-        winners = set(w.id for w in self.winners())
-        for wp in self.picksets.all():
-            wp.update_status(wp.id in winners)
+        def keyfn(ps):
+            return (ps.num_correct, -abs(ps.points - self.points))
+
+        picksets = list(picksets)
+        best = max(map(keyfn, picksets)) if self.points and picksets else None
+        now = timezone.now()
+        changed = []
+        for ps in picksets:
+            status = (ps.num_correct, ps.num_picks - ps.num_correct, keyfn(ps) == best)
+            if status != (ps.correct, ps.wrong, ps.is_winner):
+                ps.correct, ps.wrong, ps.is_winner = status
+                ps.updated = now
+                changed.append(ps)
+
+        if changed:
+            PickSet.objects.bulk_update(changed, ["correct", "wrong", "is_winner", "updated"])
+
+        refreshed = picksets if points_changed else changed
+        if refreshed:
+            cache.bump_version("gameset", self.id)
+            PickerStanding.objects.refresh(
+                self.league, self.season, users={ps.user_id for ps in refreshed}
+            )
+
+        return len(changed)
+
+    def rescore_games(self, changes):
+        """
+        Incrementally rescore the gameset for ``changes``, a dict of
+        ``{game_id: (old_status, new_status)}``.
+
+        Only the picks on those games are read; every PickSet with a pick on them gets
+        its ``correct`` adjusted by a single ``UPDATE`` of grouped increments and its
+        ``wrong`` recomputed, and ``is_winner`` is recomputed only if first place could
+        have changed. Returns the number of PickSets updated.
+        """
+        Status = sports.Game.Status
+        changes = {pk: change for pk, change in changes.items() if change[0] != change[1]}
+        deltas = defaultdict(int)
+        users = set()
+        for pick_id, user_id, game_id, winner_id, home_id, away_id in GamePick.objects.filter(
+            game__gameset=self, game__in=changes
+        ).values_list("pick", "pick__user", "game", "winner", "game__home", "game__away"):
+            users.add(user_id)
+            delta = 0
+            if winner_id:
+                sides = {Status.HOME_WIN: home_id, Status.AWAY_WIN: away_id}
+                old, new = changes[game_id]
+                delta = (winner_id == sides.get(new)) - (winner_id == sides.get(old))
+
+            deltas[pick_id] += delta
+
+        if not deltas:
+            return 0
+
+        # Picks with no change in correct still need wrong recomputed, as wrong counts
+        # every pick that isn't correct
+        changed = list(deltas)
+        by_delta = defaultdict(list)
+        for pick_id, delta in deltas.items():
+            if delta:
+                by_delta[delta].append(pick_id)
+
+        delta = models.Case(
+            *[models.When(id__in=ids, then=models.Value(d)) for d, ids in by_delta.items()],
+            default=models.Value(0),
+        )
+        num_picks = models.Subquery(
+            GamePick.objects.filter(pick=models.OuterRef("pk"))
+            .order_by()
+            .values("pick")
+            .annotate(count=models.Count("pk"))
+            .values("count")
+        )
+        with transaction.atomic():
+            winners = {}
+            if self.points:
+                winners = dict(self.picksets.filter(is_winner=True).values_list("id", "correct"))
+
+            # wrong is assigned first since MySQL applies SET clauses left to right
+            PickSet.objects.filter(id__in=changed).update(
+                wrong=num_picks - models.F("correct") - delta,
+                correct=models.F("correct") + delta,
+                updated=timezone.now(),
+            )
+
+            if self.points:
+                top = PickSet.objects.filter(id__in=changed).aggregate(top=models.Max("correct"))[
+                    "top"
+                ]
+                if not winners or winners.keys() & set(changed) or top >= min(winners.values()):
+                    users.update(self.update_winners())
+
+        cache.bump_version("gameset", self.id)
+        PickerStanding.objects.refresh(self.league, self.season, users=users)
+        return len(changed)
+
+    def update_winners(self):
+        """
+        Recompute ``is_winner`` for the gameset's PickSets from their stored counts.
+        Returns the ids of the users whose ``is_winner`` changed.
+        """
+        picksets = list(self.picksets.values_list("id", "user", "correct", "points", "is_winner"))
+        keys = {pk: (correct, -abs(points - self.points)) for pk, _, correct, points, _ in picksets}
+        best = max(keys.values()) if self.points and keys else None
+        winners = {pk for pk, key in keys.items() if key == best}
+        flipped = [user for pk, user, _, _, is_winner in picksets if is_winner != (pk in winners)]
+        self.picksets.filter(id__in=winners, is_winner=False).update(is_winner=True)
+        self.picksets.exclude(id__in=winners).filter(is_winner=True).update(is_winner=False)
+        return flipped
 
     def results(self):
-        picks = list(self.picksets.select_related())
-        return utils.sorted_standings(
-            picks, key=lambda ps: (ps.correct, -ps.points_delta), reverse=True
+        return list(self.picksets.ranked().select_related("user", "gameset"))
+
+    def results_matrix(self, picksets=None):
+        """
+        Build the user x game grid for the results page.
+
+        Returns a namespace with ``games``, the ``display_results`` mapping of the started
+        games, and ``rows``, a list of ``(pickset, picks)`` pairs where ``picks`` is a list
+        of ``(game_id, winner_abbr)`` aligned with ``games``. All of the gamepicks for the
+        started games are loaded with a single query, limited to ``picksets`` (such as a
+        page of standings) when given.
+        """
+        if picksets is None:
+            picksets = self.results()
+            scope = {"pick__gameset": self}
+        else:
+            picksets = list(picksets)
+            scope = {"pick__in": [ps.id for ps in picksets]}
+
+        games = self.games.display_results()
+        picks = {}
+        if games and picksets:
+            for pick_id, game_id, winner_abbr in GamePick.objects.filter(
+                game__in=list(games), **scope
+            ).values_list("pick", "game", "winner__abbr"):
+                picks.setdefault(pick_id, {})[game_id] = winner_abbr
+
+        rows = []
+        for ps in picksets:
+            winners = picks.get(ps.id, {})
+            rows.append((ps, [(game_id, winners.get(game_id)) for game_id in games]))
+
+        return SimpleNamespace(games=games, rows=rows)
+
+
+class PickerStandingManager(models.Manager):
+    def refresh(self, league, season=None, groups=None, users=None):
+        """
+        Recompute the stored standings of ``league`` for ``season`` and all-time, for
+        each of ``groups`` (defaults to every group playing ``league``). With ``users``,
+        only those users' totals are recomputed and the places of the groups' existing
+        rows are adjusted around them.
+        """
+        if groups is None:
+            groups = PickerGrouping.objects.filter(leagues=league)
+
+        if users is not None:
+            return self.refresh_users(league, season, groups, users)
+
+        memberships = PickerMembership.objects.filter(group__in=groups, user__is_active=True)
+        members = {}
+        for group_id, user_id in memberships.values_list("group", "user"):
+            members.setdefault(group_id, set()).add(user_id)
+
+        scopes = [season, None] if season else [None]
+        standings = []
+        for scope in scopes:
+            totals = stats.RosterStats.aggregate(league, scope, user__in=memberships.values("user"))
+            for group_id, group_users in members.items():
+                entries = [
+                    self.model(
+                        group_id=group_id,
+                        league=league,
+                        season=scope,
+                        user_id=user_id,
+                        **totals.get(user_id, {}),
+                    )
+                    for user_id in group_users
+                ]
+                standings.extend(utils.sorted_standings(entries, key=self.standing_key))
+
+        with transaction.atomic():
+            self.filter(league=league, group__in=groups).filter(
+                models.Q(season__in=[s for s in scopes if s]) | models.Q(season__isnull=True)
+            ).delete()
+            self.bulk_create(standings)
+
+        cache.bump_version("standings", league.id)
+        return standings
+
+    @staticmethod
+    def standing_key(entry):
+        return (entry.correct, -entry.points_delta, entry.picksets_played, -entry.user_id)
+
+    def refresh_users(self, league, season, groups, users):
+        """
+        Update the stored rows of ``users`` in ``season`` and all-time, re-placing the
+        rest of their groups from the stored totals. Groups without stored standings for
+        a scope are rebuilt in full.
+        """
+        users = set(users)
+        fields = ["correct", "wrong", "points_delta", "picksets_played", "picksets_won"]
+        scopes = [season, None] if season else [None]
+        groups = set(
+            PickerMembership.objects.filter(group__in=groups, user__in=users).values_list(
+                "group", flat=True
+            )
+        )
+        if not groups:
+            return []
+
+        rows = {}
+        for entry in self.filter(league=league, group__in=groups).filter(
+            models.Q(season=season) | models.Q(season__isnull=True)
+        ):
+            rows.setdefault((entry.season, entry.group_id), []).append(entry)
+
+        missing = {group_id for group_id in groups for s in scopes if (s, group_id) not in rows}
+        changed = []
+        for scope in scopes:
+            scoped = [rows[scope, g] for g in groups - missing]
+            if not scoped:
+                continue
+
+            totals = stats.RosterStats.aggregate(league, scope, user__in=users)
+            for entries in scoped:
+                before = {e.id: (e.place, *[getattr(e, f) for f in fields]) for e in entries}
+                for entry in entries:
+                    if entry.user_id in users:
+                        user_totals = totals.get(entry.user_id, {})
+                        for field in fields:
+                            setattr(entry, field, user_totals.get(field, 0))
+
+                for entry in utils.sorted_standings(entries, key=self.standing_key):
+                    if before[entry.id] != (entry.place, *[getattr(entry, f) for f in fields]):
+                        changed.append(entry)
+
+        if changed:
+            self.bulk_update(changed, ["place", *fields, "updated"])
+            cache.bump_version("standings", league.id)
+
+        if missing:
+            changed.extend(self.refresh(league, season, groups=missing))
+
+        return changed
+
+    def standings(self, league, group, season=None):
+        """
+        Return the ordered standings of ``group`` for ``season`` (all-time if ``None``),
+        computing and storing them first if needed.
+        """
+        queryset = self.filter(league=league, group=group, season=season).select_related("user")
+        if not queryset.exists():
+            self.refresh(league, season, groups=[group])
+
+        return queryset
+
+    def roster(self, league, group, season=None, entries=None):
+        """
+        Return ``(season_entry, all_time_entry)`` pairs for the members of ``group``,
+        ordered by their season place. ``entries`` limits the roster to a subset (such as
+        a page) of the season standings.
+        """
+        if entries is None:
+            entries = self.standings(league, group, season)
+
+        entries = list(entries)
+        if not season:
+            return [(e, e) for e in entries]
+
+        all_time = {
+            e.user_id: e
+            for e in self.filter(
+                league=league,
+                group=group,
+                season__isnull=True,
+                user__in=[e.user_id for e in entries],
+            )
+        }
+        return [(e, all_time[e.user_id]) for e in entries if e.user_id in all_time]
+
+
+class PickerStanding(models.Model):
+    """
+    Stored roster standings for a group, league and season; a ``None`` season holds the
+    all-time standings.
+    """
+
+    group = models.ForeignKey(PickerGrouping, on_delete=models.CASCADE, related_name="standings")
+    league = models.ForeignKey(sports.League, on_delete=models.CASCADE, related_name="standings")
+    season = models.PositiveSmallIntegerField(blank=True, null=True)
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="picker_standings"
+    )
+    place = models.PositiveIntegerField(default=0)
+    correct = models.PositiveIntegerField(default=0)
+    wrong = models.PositiveIntegerField(default=0)
+    points_delta = models.PositiveIntegerField(default=0)
+    picksets_played = models.PositiveIntegerField(default=0)
+    picksets_won = models.PositiveIntegerField(default=0)
+    updated = models.DateTimeField(auto_now=True)
+
+    objects = PickerStandingManager()
+
+    class Meta:
+        ordering = ("place", "user__username")
+        unique_together = (("group", "league", "season", "user"),)
+
+    def __str__(self):
+        return "{}{}: {}".format(
+            self.user, " ({})".format(self.season) if self.season else "", self.place
         )
+
+    @property
+    def is_active(self):
+        return self.user.is_active
+
+    @property
+    def pct(self):
+        return stats.percent(self.correct, self.correct + self.wrong)
+
+    @property
+    def avg_points_delta(self):
+        return self.points_delta / self.picksets_played if self.picksets_played else 0
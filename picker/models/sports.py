@@ -6,7 +6,7 @@ from types import SimpleNamespace
 
 from django.db import models
 from django.urls import reverse
-from django.utils import timezone
+from django.utils import timezone, dateformat
 from django.db import OperationalError
 from django.utils.functional import cached_property
 from django.core.exceptions import ValidationError
@@ -14,6 +14,7 @@ from django.core.exceptions import ValidationError
 from dateutil.parser import parse as parse_dt
 
 from ..conf import picker_settings
+from .. import cache
 from .. import importers
 
 __all__ = [
@@ -32,6 +33,12 @@ __all__ = [
 LOGOS_DIR = picker_settings.get("LOGOS_UPLOAD_DIR", "picker/logos")
 TIE_KEY = "__TIE__"
 
+# Live game details reported by score feeds that are cached rather than stored
+LIVE_KEYS = ("status", "pos", "clock", "url")
+
+# League id -> (teams version, team rows, alias rows), shared by all League instances
+_team_indexes = {}
+
 
 def temp_slug():
     return "{:10.0f}".format(random.random() * 10000000000)
@@ -94,16 +101,33 @@ class League(models.Model):
 
     @cached_property
     def team_dict(self):
+        """
+        Map team abbrs, ids, full names and aliases to teams. The underlying rows are
+        shared across the process and reloaded only when the league's teams or aliases
+        change; the ``Team`` instances are built for, and bound to, this league.
+        """
+        attnames = [field.attname for field in Team._meta.concrete_fields]
+        version = cache.get_version("teams", self.id)
+        cached_version, rows, aliases = _team_indexes.get(self.id, (None, None, None))
+        if cached_version != version:
+            rows = list(self.teams.values_list(*attnames))
+            aliases = list(
+                Alias.objects.filter(team__league=self).order_by().values_list("team", "name")
+            )
+            _team_indexes[self.id] = (version, rows, aliases)
+
         names = {}
-        for team in self.teams.all():
+        db = self._state.db or "default"
+        for row in rows:
+            team = Team.from_db(db, attnames, row)
+            team.league = self
             names[team.abbr] = team
             names[team.id] = team
             if team.nickname:
-                full_name = "{} {}".format(team.name, team.nickname)
-                names[full_name] = team
+                names["{} {}".format(team.name, team.nickname)] = team
 
-            for alias in Alias.objects.filter(team=team).values_list("name", flat=True):
-                names[alias] = team
+        for team_id, alias in aliases:
+            names[alias] = names[team_id]
 
         return names
 
@@ -129,29 +153,97 @@ class League(models.Model):
     def current_gameset(self):
         rel = timezone.now()
         try:
-            return self.gamesets.get(opens__lte=rel, closes__gte=rel)
+            return self.gamesets.with_bounds().get(opens__lte=rel, closes__gte=rel)
         except GameSet.DoesNotExist:
             return None
 
+    @cached_property
+    def season_map(self):
+        """
+        Return ``{season: [{"id", "season", "sequence"}, ...]}`` for the league's gamesets,
+        in season and sequence order, cached until its gamesets change.
+        """
+        return cache.get_or_set("season_map", [("seasons", self.id)], self._season_map)
+
+    def _season_map(self):
+        seasons = {}
+        for pk, season, sequence in self.gamesets.order_by("season", "sequence").values_list(
+            "id", "season", "sequence"
+        ):
+            seasons.setdefault(season, []).append(
+                {"id": pk, "season": season, "sequence": sequence}
+            )
+
+        return seasons
+
     @cached_property
     def available_seasons(self):
-        return self.gamesets.order_by("-season").values_list("season", flat=True).distinct()
+        return sorted(self.season_map, reverse=True)
+
+    def team_records(self, season=None, before=None):
+        """
+        Return a dict of ``{team_id: (wins, losses, ties)}`` for the teams of the league
+        that have played in ``season``, cached until the league's games change.
+
+        If ``before`` is given, only games of GameSets with a lower sequence are counted.
+        """
+        season = season or self.current_season
+        return cache.get_or_set(
+            "team_records:{}:{}".format(season, before or ""),
+            [("league", self.id)],
+            lambda: self._team_records(season, before),
+        )
+
+    def _team_records(self, season, before=None):
+        Status = Game.Status
+        records = {}
+        games = Game.objects.filter(
+            gameset__league=self,
+            gameset__season=season,
+            status__in=[Status.TIE, Status.HOME_WIN, Status.AWAY_WIN],
+        )
+        if before is not None:
+            games = games.filter(gameset__sequence__lt=before)
+
+        for home, away, status, count in (
+            games.order_by()
+            .values_list("home", "away", "status")
+            .annotate(count=models.Count("id"))
+        ):
+            home_record = records.setdefault(home, [0, 0, 0])
+            away_record = records.setdefault(away, [0, 0, 0])
+            if status == Status.TIE:
+                home_record[2] += count
+                away_record[2] += count
+            elif status == Status.HOME_WIN:
+                home_record[0] += count
+                away_record[1] += count
+            else:
+                away_record[0] += count
+                home_record[1] += count
+
+        return {team_id: tuple(record) for team_id, record in records.items()}
 
     def season_gamesets(self, season=None):
         season = season or self.current_season or self.latest_season
         return self.gamesets.filter(season=season)
 
     def random_points(self):
+        low, high = self.points_range
+        return random.randint(low, high)
+
+    @cached_property
+    def points_range(self):
         try:
             d = self.gamesets.filter(points__gt=0).aggregate(
                 stddev=models.StdDev("points"), avg=models.Avg("points")
             )
         except OperationalError:
-            return 0
+            return (0, 0)
         else:
             avg = int(d.get("avg") or 0)
             stddev = int(d.get("stddev") or 0)
-            return random.randint(avg - stddev, avg + stddev)
+            return (avg - stddev, avg + stddev)
 
     @cached_property
     def _config(self):
@@ -175,11 +267,17 @@ class League(models.Model):
         return self._config.get(key, default)
 
     @classmethod
-    def import_season(cls, data):
+    def import_season(cls, data, bulk=False):
+        if bulk:
+            return importers.bulk_import_season(cls, data)
+
         return importers.import_season(cls, data)
 
     @classmethod
-    def import_league(cls, data):
+    def import_league(cls, data, bulk=False):
+        if bulk:
+            return importers.bulk_import_league(cls, data)
+
         return importers.import_league(cls, data)
 
     @classmethod
@@ -257,22 +355,7 @@ class Team(models.Model):
         }
 
     def season_record(self, season=None):
-        season = season or self.league.current_season
-        Q, Count, Status = models.Q, models.Count, Game.Status
-        values = Game.objects.filter(gameset__season=season).aggregate(
-            wins=Count(
-                "pk",
-                filter=Q(status=Status.AWAY_WIN, away=self) | Q(status=Status.HOME_WIN, home=self),
-            ),
-            losses=Count(
-                "pk",
-                filter=Q(status=Status.AWAY_WIN, home=self) | Q(status=Status.HOME_WIN, away=self),
-            ),
-            ties=Count(
-                "pk", filter=Q(status=Status.TIE, away=self) | Q(status=Status.TIE, home=self)
-            ),
-        )
-        return (values["wins"], values["losses"], values["ties"])
+        return self.league.team_records(season).get(self.id, (0, 0, 0))
 
     def _old_season_record(self, season=None):
         season = season or self.league.current_season
@@ -364,6 +447,18 @@ class Alias(models.Model):
         return self.name
 
 
+class GameSetQuerySet(models.QuerySet):
+    def with_bounds(self):
+        """
+        Annotate each gameset with the start of its first and last games, as used by
+        ``GameSet.bounds``, and select its league for ``end_time``.
+        """
+        return self.select_related("league").annotate(
+            first_start=models.Min("games__start_time"),
+            last_start=models.Max("games__start_time"),
+        )
+
+
 class GameSet(models.Model):
     league = models.ForeignKey(League, on_delete=models.CASCADE, related_name="gamesets")
     season = models.PositiveSmallIntegerField()
@@ -373,11 +468,14 @@ class GameSet(models.Model):
     closes = models.DateTimeField()
     description = models.CharField(max_length=60, default="", blank=True)
     label = models.CharField(max_length=12, blank=True)
+    rescore_after = models.DateTimeField(blank=True, null=True, editable=False)
 
     byes = models.ManyToManyField(
         Team, blank=True, verbose_name="Bye Teams", related_name="bye_set"
     )
 
+    objects = GameSetQuerySet.as_manager()
+
     class Meta:
         ordering = ("season", "sequence")
 
@@ -447,29 +545,140 @@ class GameSet(models.Model):
         return self.games.first()
 
     @cached_property
+    def bounds(self):
+        """
+        The ``(first, last)`` game start times, or ``(None, None)`` without games. Read
+        from the ``GameSetQuerySet.with_bounds`` annotations when present.
+        """
+        try:
+            return (self.first_start, self.last_start)
+        except AttributeError:
+            agg = self.games.aggregate(
+                first=models.Min("start_time"), last=models.Max("start_time")
+            )
+            return (agg["first"], agg["last"])
+
+    @property
     def start_time(self):
-        return self.first_game.start_time
+        return self.bounds[0]
 
     @property
     def end_time(self):
-        return self.last_game.end_time
+        last = self.bounds[1]
+        if last:
+            return last + timedelta(minutes=self.league.avg_game_duration)
 
     @property
     def in_progress(self):
-        return self.end_time >= timezone.now() >= self.start_time
+        start, end = self.start_time, self.end_time
+        return (end >= timezone.now() >= start) if start else False
 
     @property
     def has_started(self):
-        return timezone.now() >= self.start_time
+        start = self.start_time
+        return (timezone.now() >= start) if start else False
+
+    @property
+    def all_started(self):
+        last = self.bounds[1]
+        return (timezone.now() >= last) if last else False
 
     @property
     def is_open(self):
-        gm = self.last_game
-        return (timezone.now() < self.last_game.start_time) if gm else False
+        last = self.bounds[1]
+        return (timezone.now() < last) if last else False
 
     def reset_games_status(self):
         UNPLAYED = Game.Status.UNPLAYED
-        self.games.exclude(status=UNPLAYED).update(status=UNPLAYED)
+        if self.games.exclude(status=UNPLAYED).update(status=UNPLAYED):
+            cache.bump_version("league", self.league_id)
+            cache.bump_version("scores", self.id)
+
+    @property
+    def live_key(self):
+        return "picker:live:{}".format(self.id)
+
+    def update_scores(self, results):
+        """
+        Store the in-progress or final scores of ``results`` (a list of game dicts in the
+        ``update_results`` schema), writing only the games whose scores changed.
+
+        Live details that have no model field (the feed's ``status`` text, ``pos``,
+        ``clock`` and ``url``) are kept in the cache. The ``("scores", id)`` version is
+        bumped whenever anything shown in the score strip changes. Returns the number of
+        games updated.
+        """
+        teams = self.league.team_dict
+        scores = {}
+        live = {}
+        for result in results:
+            home = teams.get(result["home"])
+            if home:
+                scores[home.id] = (
+                    int(result.get("home_score") or 0),
+                    int(result.get("away_score") or 0),
+                )
+                live[home.id] = {key: result.get(key) for key in LIVE_KEYS}
+
+        changed = []
+        for game in self.games.filter(home__in=scores).order_by():
+            home_score, away_score = scores[game.home_id]
+            if (game.home_score, game.away_score) != (home_score, away_score):
+                game.home_score = home_score
+                game.away_score = away_score
+                changed.append(game)
+
+        if changed:
+            Game.objects.bulk_update(changed, ["home_score", "away_score"])
+
+        store = cache.get_cache()
+        previous = store.get(self.live_key, {})
+        current = {**previous, **live}
+        if current != previous:
+            store.set(self.live_key, current, cache.default_timeout())
+
+        if changed or current != previous:
+            cache.bump_version("scores", self.id)
+
+        return len(changed)
+
+    def scores(self):
+        """
+        Return the score strip payload, cached until the gameset's scores version changes.
+        """
+        return cache.get_or_set("scores", [("scores", self.id)], self._scores)
+
+    def _scores(self):
+        Status = Game.Status
+        live = cache.get_cache().get(self.live_key, {})
+        url = reverse("picker-schedule-year", args=[self.league.slug, self.season])
+        games = []
+        for game in self.games.select_related("home", "away"):
+            state = live.get(game.home_id, {})
+            if game.status == Status.UNPLAYED:
+                status = state.get("status") or "Pending"
+            elif game.status == Status.CANCELLED:
+                status = game.get_status_display()
+            else:
+                status = "Final"
+
+            start = timezone.localtime(game.start_time)
+            games.append(
+                {
+                    "away": game.away.abbr,
+                    "home": game.home.abbr,
+                    "pos": state.get("pos"),
+                    "away_score": game.away_score,
+                    "home_score": game.home_score,
+                    "url": state.get("url") or url,
+                    "status": status,
+                    "day": dateformat.format(start, "D"),
+                    "time": dateformat.format(start, "P"),
+                    "clock": state.get("clock") if status != "Final" else None,
+                }
+            )
+
+        return {"games": games}
 
 
 class GameManager(models.Manager):
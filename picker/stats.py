@@ -1,4 +1,4 @@
-from django.db.models import Q
+from django.db.models import Q, F, Case, When, Value, Count, Sum
 from django.contrib.auth import get_user_model
 from .utils import sorted_standings
 
@@ -8,37 +8,18 @@ def percent(num, denom):
 
 
 class RosterStats:
-    def __init__(self, user, league, season=None):
+    def __init__(self, user, league, season=None, totals=None):
         self.user = user
         self.season = season
         self.league = league
-        self.correct = 0
-        self.wrong = 0
-        self.points_delta = 0
-
-        queryset = (
-            self.user.picksets.filter(gameset__league=league)
-            .select_related()
-            .filter(Q(correct__gt=0) | Q(wrong__gt=0))
-        )
-
-        if season:
-            queryset = queryset.filter(gameset__season=season)
-
-        self.picksets_played = 0
-        self.picksets_won = 0
-        for correct, wrong, is_winner, points, actual_points in queryset.values_list(
-            "correct", "wrong", "is_winner", "points", "gameset__points"
-        ):
-            self.picksets_played += 1
-            self.correct += correct
-            self.wrong += wrong
-            if actual_points:
-                self.points_delta += abs(points - actual_points)
-
-            if is_winner:
-                self.picksets_won += 1
+        if totals is None:
+            totals = self.aggregate(league, season, user=user).get(user.id, {})
 
+        self.correct = totals.get("correct", 0)
+        self.wrong = totals.get("wrong", 0)
+        self.points_delta = totals.get("points_delta", 0)
+        self.picksets_played = totals.get("picksets_played", 0)
+        self.picksets_won = totals.get("picksets_won", 0)
         self.is_active = self.user.is_active
         self.pct = percent(self.correct, self.correct + self.wrong)
         self.avg_points_delta = (
@@ -50,16 +31,66 @@ class RosterStats:
 
     __repr__ = __str__
 
+    @staticmethod
+    def aggregate(league, season=None, **filters):
+        """
+        Return a dict of ``{user_id: totals}`` for every user with scored picksets in
+        ``league`` (and ``season``, if given), computed with one ``GROUP BY user`` query.
+        """
+        from .models import PickSet
+
+        queryset = PickSet.objects.filter(gameset__league=league, **filters).filter(
+            Q(correct__gt=0) | Q(wrong__gt=0)
+        )
+        if season:
+            queryset = queryset.filter(gameset__season=season)
+
+        rows = (
+            queryset.order_by()
+            .values("user")
+            .annotate(
+                total_correct=Sum("correct"),
+                total_wrong=Sum("wrong"),
+                total_points_delta=Sum(
+                    Case(
+                        When(gameset__points=0, then=Value(0)),
+                        When(
+                            points__gte=F("gameset__points"),
+                            then=F("points") - F("gameset__points"),
+                        ),
+                        default=F("gameset__points") - F("points"),
+                    )
+                ),
+                played=Count("pk"),
+                won=Count("pk", filter=Q(is_winner=True)),
+            )
+        )
+        return {
+            row["user"]: {
+                "correct": row["total_correct"],
+                "wrong": row["total_wrong"],
+                "points_delta": row["total_points_delta"],
+                "picksets_played": row["played"],
+                "picksets_won": row["won"],
+            }
+            for row in rows
+        }
+
     @classmethod
     def get_details(cls, league, group, season=None):
         season = season or league.current_season
-        users = get_user_model().objects.filter(is_active=True, picker_memberships__group=group)
+        members = get_user_model().objects.filter(is_active=True, picker_memberships__group=group)
+        users = list(members)
 
         def keyfn(rs):
             return (rs.correct, -rs.points_delta, rs.picksets_played)
 
-        stats = [cls(u, league) for u in users]
-        by_user = {entry.user: entry for entry in sorted_standings(stats, key=keyfn)}
-        stats = [cls(u, league, season) for u in users]
-        results = [(e, by_user[e.user]) for e in sorted_standings(stats, key=keyfn)]
+        def standings(season=None):
+            totals = cls.aggregate(league, season, user__in=members)
+            return sorted_standings(
+                [cls(u, league, season, totals.get(u.id, {})) for u in users], key=keyfn
+            )
+
+        by_user = {entry.user: entry for entry in standings()}
+        results = [(e, by_user[e.user]) for e in standings(season)]
         return results
@@ -22,10 +22,17 @@ def user_result(user_pick, actual_results):
 def season_nav(context, gameset, relative_to):
     user = context["user"]
     league = context["league"]
+    season_map = league.season_map
+    season = gameset.season if gameset else None
+    season = season or league.current_season or max(season_map, default=None)
+    season_gamesets = season_map.get(season, [])
     prev = following = None
     if gameset:
-        prev = gameset.previous_gameset
-        following = gameset.next_gameset
+        ids = [gs["id"] for gs in season_gamesets]
+        if gameset.id in ids:
+            index = ids.index(gameset.id)
+            prev = season_gamesets[index - 1] if index else None
+            following = season_gamesets[index + 1] if index + 1 < len(ids) else None
 
     return {
         "gameset": gameset,
@@ -36,7 +43,7 @@ def season_nav(context, gameset, relative_to):
         "previous": prev,
         "following": following,
         "is_manager": user.is_superuser or user.is_staff,
-        "season_gamesets": league.season_gamesets(gameset.season if gameset else None),
+        "season_gamesets": season_gamesets,
     }
 
 
@@ -54,9 +61,18 @@ def all_seasons_nav(context, current, league, relative_to):
     }
 
 
+@register.inclusion_tag(get_templates("@score_strip.html"))
+def score_strip(gameset):
+    return {"scores": gameset.scores() if gameset else {"games": []}}
+
+
 @register.simple_tag(takes_context=True)
 def favorite_team(context, user, league=None):
     league = league or context["league"]
+    picker = context.get("picker")
+    if picker:
+        return picker.favorite(user, league)
+
     try:
         return PickerFavorite.objects.get(user=user, league=league).team
     except PickerFavorite.DoesNotExist:
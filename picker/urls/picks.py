@@ -13,6 +13,7 @@ converters.register_converter(SignedIntConverter, "uint")
 management_urls = [
     path("", views.ManagementHome.as_view(), name="picker-manage"),
     path("game/<int:game_id>/", views.ManageGame.as_view(), name="picker-manage-game"),
+    path("results/", views.ResultsWebhook.as_view(), name="picker-results-webhook"),
     path(
         "<int:season>/",
         include(
@@ -1,3 +1,6 @@
+import hashlib
+from functools import lru_cache
+
 from django import http
 from django.urls import reverse
 from django.template import loader
@@ -6,12 +9,83 @@ from django.utils import timezone
 from django.views.generic import TemplateView
 from django.views.generic.edit import FormMixin
 from django.shortcuts import get_object_or_404
+from django.utils.cache import get_conditional_response
 from django.utils.functional import cached_property
 from django.core.exceptions import ImproperlyConfigured
 from django.contrib.auth.mixins import LoginRequiredMixin
 
+from .. import cache
 from .. import utils
-from ..models import League, Preference, PickerMembership
+from ..conf import get_setting
+from ..models import League, Preference, PickerFavorite, PickerMembership
+
+
+@lru_cache
+def league_base(slug):
+    return loader.select_template(
+        ["picker/{}/base.html".format(slug), "picker/base.html"]
+    ).origin.template_name
+
+
+class PickerContext:
+    """
+    Per-request picker state shared by views and template tags. The user's preferences,
+    memberships and favorites are loaded together once, and kept for
+    ``PICKER["CONTEXT_CACHE_TIMEOUT"]`` seconds (``0`` disables) under the user's version.
+    """
+
+    def __init__(self, request, league):
+        self.user = request.user
+        self.league = league
+
+    @cached_property
+    def user_data(self):
+        user = self.user
+        if not user.is_authenticated:
+            return {"preferences": None, "memberships": [], "favorites": {}}
+
+        def load():
+            return {
+                "preferences": Preference.objects.get(user=user),
+                "memberships": list(PickerMembership.objects.for_user(user)),
+                "favorites": {
+                    fav.league_id: fav.team
+                    for fav in PickerFavorite.objects.filter(user=user).select_related("team")
+                },
+            }
+
+        timeout = get_setting("CONTEXT_CACHE_TIMEOUT", 60)
+        if not timeout:
+            return load()
+
+        return cache.get_or_set("context", [("user", user.id)], load, timeout)
+
+    @property
+    def preferences(self):
+        return self.user_data["preferences"]
+
+    @cached_property
+    def memberships(self):
+        league = self.league
+        return [mbr for mbr in self.user_data["memberships"] if league in mbr.group.leagues.all()]
+
+    @cached_property
+    def league_favorites(self):
+        return {
+            fav.user_id: fav.team
+            for fav in PickerFavorite.objects.filter(league=self.league).select_related("team")
+        }
+
+    def favorite(self, user, league=None):
+        league = league or self.league
+        if user.id == self.user.id:
+            return self.user_data["favorites"].get(league.id)
+
+        if league == self.league:
+            return self.league_favorites.get(user.id)
+
+        fav = PickerFavorite.objects.filter(user=user, league=league).select_related("team")
+        return fav[0].team if fav else None
 
 
 class SimpleFormMixin(FormMixin):
@@ -60,6 +134,66 @@ class SimplePickerViewBase(TemplateView):
     def league(self):
         return get_object_or_404(League.objects.active(), slug=self.kwargs["league"])
 
+    @cached_property
+    def picker(self):
+        return PickerContext(self.request, self.league)
+
+    def get_etag_scopes(self):
+        """
+        Return the ``(name, scopes)`` of the versioned data the page renders, enabling
+        conditional GETs, or ``None`` to always render.
+        """
+        return None
+
+    def get_etag(self):
+        request = self.request
+        etag_scopes = self.get_etag_scopes()
+        # Pending messages are consumed by rendering, so they always need a full page
+        if etag_scopes is None or len(messages.get_messages(request)):
+            return None
+
+        name, scopes = etag_scopes
+        # Every page renders the league's season navigation
+        scopes = [*scopes, ("seasons", self.league.id)]
+        user = request.user
+        if user.is_authenticated:
+            scopes.append(("user", user.id))
+
+        key = "{}:{}:{}:{}".format(
+            self.__class__.__name__,
+            request.get_full_path(),
+            user.id,
+            cache.versioned_key(name, *scopes),
+        )
+        return '"{}"'.format(hashlib.md5(key.encode()).hexdigest())
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = self.get_etag()
+        if etag:
+            not_modified = get_conditional_response(request, etag=etag)
+            if not_modified is not None:
+                return not_modified
+
+        response = super().dispatch(request, *args, **kwargs)
+        if etag and response.status_code == 200:
+            response["ETag"] = etag
+
+        return response
+
+    @staticmethod
+    def cached(name, scopes, default):
+        """
+        Return ``default()`` through the versioned cache, keyed by ``name`` and the current
+        versions of ``scopes``. Disabled with ``PICKER["CACHE_VIEWS"] = False``.
+        """
+        if not get_setting("CACHE_VIEWS", True):
+            return default()
+
+        return cache.get_or_set(name, scopes, default)
+
     def get_template_names(self, template_override=None):
         if template_override is None and self.template_name is None:
             raise ImproperlyConfigured(
@@ -81,12 +215,8 @@ class SimplePickerViewBase(TemplateView):
                 "now": timezone.now(),
                 "league": league,
                 "season": self.season or league.current_season,
-                "league_base": loader.select_template(
-                    [
-                        "picker/{}/base.html".format(league.slug),
-                        "picker/base.html",
-                    ]
-                ),
+                "league_base": league_base(league.slug),
+                "picker": self.picker,
             }
         )
         return data
@@ -107,11 +237,11 @@ class SimplePickerViewBase(TemplateView):
 class PickerViewBase(LoginRequiredMixin, SimplePickerViewBase):
     def get_context_data(self, **kwargs):
         return super().get_context_data(
-            preferences=Preference.objects.get(user=self.request.user),
+            preferences=self.picker.preferences,
             memberships=self.memberships,
             **kwargs,
         )
 
-    @cached_property
+    @property
     def memberships(self):
-        return list(PickerMembership.objects.for_user(self.request.user, league=self.league))
+        return self.picker.memberships
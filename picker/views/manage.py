@@ -1,15 +1,23 @@
+import hmac
+import json
+
 from django import http
+from django.db import transaction
+from django.views import View
 from django.contrib import messages
+from django.utils.decorators import method_decorator
+from django.views.decorators.csrf import csrf_exempt
 from django.utils.functional import cached_property
 from django.shortcuts import get_object_or_404, get_list_or_404
 from django.contrib.auth.mixins import UserPassesTestMixin
 
 from .. import forms
-from ..models import Game, GameSetPicks
+from ..models import League, Game, GameSetPicks
+from ..exceptions import PickerResultException
 from .base import PickerViewBase, SimpleFormMixin
 
 
-__all__ = ["ManagementHome", "ManageSeason", "ManageWeek", "ManageGame"]
+__all__ = ["ManagementHome", "ManageSeason", "ManageWeek", "ManageGame", "ResultsWebhook"]
 
 
 class ManagementMixin(UserPassesTestMixin):
@@ -45,7 +53,10 @@ class ManageWeek(SimpleFormMixin, ManagementViewBase):
     @cached_property
     def gameset(self):
         return get_object_or_404(
-            GameSetPicks, league=self.league, season=self.season, sequence=self.kwargs["sequence"]
+            GameSetPicks.objects.with_bounds(),
+            league=self.league,
+            season=self.season,
+            sequence=self.kwargs["sequence"],
         )
 
     def get_context_data(self, **kwargs):
@@ -90,3 +101,61 @@ class ManageGame(SimpleFormMixin, ManagementViewBase):
     def form_valid(self, form):
         form.save()
         return super().form_valid(form)
+
+
+@method_decorator(csrf_exempt, name="dispatch")
+class ResultsWebhook(View):
+    """
+    Accepts pushed results in the ``update_results`` schema, either a single gameset or
+    a list of them, authenticated with ``Authorization: Bearer <RESULTS_WEBHOOK_TOKEN>``.
+    Rescoring is coalesced per gameset.
+    """
+
+    http_method_names = ["post"]
+
+    def authorized(self, league):
+        token = league.config("RESULTS_WEBHOOK_TOKEN")
+        auth = self.request.headers.get("Authorization", "")
+        scheme, _, value = auth.partition(" ")
+        return bool(token) and scheme == "Bearer" and hmac.compare_digest(value, token)
+
+    def post(self, request, *args, **kwargs):
+        league = get_object_or_404(League.objects.active(), slug=kwargs["league"])
+        if not self.authorized(league):
+            return http.JsonResponse({"error": "Invalid token"}, status=403)
+
+        try:
+            data = json.loads(request.body)
+        except ValueError:
+            return http.JsonResponse({"error": "Invalid JSON"}, status=400)
+
+        # Rescorings lost with the process that scheduled them are run once overdue
+        GameSetPicks.objects.rescore_pending(league=league)
+
+        # Every entry is checked before any is applied, and all are applied or none
+        updates = []
+        try:
+            items = [
+                (
+                    GameSetPicks.objects.select_related("league").get(
+                        league=league, season=results["season"], sequence=results["sequence"]
+                    ),
+                    results,
+                )
+                for results in (data if isinstance(data, list) else [data])
+            ]
+            with transaction.atomic():
+                for gameset, results in items:
+                    finished, points = gameset.update_results(results, coalesce=True)
+                    updates.append(
+                        {
+                            "season": gameset.season,
+                            "sequence": gameset.sequence,
+                            "finished": finished,
+                            "points": points,
+                        }
+                    )
+        except (KeyError, TypeError, GameSetPicks.DoesNotExist, PickerResultException) as exc:
+            return http.JsonResponse({"error": "Invalid results: {}".format(exc)}, status=400)
+
+        return http.JsonResponse({"updated": updates})
@@ -1,10 +1,14 @@
+from urllib.parse import urlencode
+
+from django.core.paginator import Page, Paginator
 from django.utils.functional import cached_property
-from django.shortcuts import get_object_or_404, get_list_or_404
+from django.http import Http404
+from django.shortcuts import get_object_or_404
 
 from .. import forms
 from ..stats import RosterStats
 from .base import SimplePickerViewBase, PickerViewBase, SimpleFormMixin
-from ..models import Preference, PickerGrouping, GameSetPicks
+from ..models import Preference, PickerGrouping, PickerStanding, PickSet, GameSetPicks
 
 
 class Home(SimplePickerViewBase):
@@ -42,7 +46,58 @@ class RosterMixin:
         return super().get_context_data(group=self.group, **kwargs)
 
 
-class Roster(RosterMixin, PickerViewBase):
+class StandingsMixin:
+    """
+    Paginates standings with the ``page``, ``size`` and ``top`` query parameters.
+    ``page=me`` jumps to the page with the current user's row, and ``top=K`` limits the
+    standings to the first ``K`` places.
+    """
+
+    def int_param(self, name):
+        try:
+            return max(int(self.request.GET[name]), 1)
+        except (KeyError, ValueError):
+            return None
+
+    def cached_standings(self, name, scopes, get_queryset, build):
+        """
+        Page the standings of ``get_queryset()`` for the request and return
+        ``build(page)``, cached per page until the versions of ``scopes`` change.
+        """
+        league = self.league
+        top = self.int_param("top")
+        size = min(
+            self.int_param("size") or league.config("STANDINGS_PAGE_SIZE", 100),
+            league.config("STANDINGS_MAX_PAGE_SIZE", 500),
+        )
+
+        def queryset():
+            qs = get_queryset()
+            return qs.filter(place__lte=top) if top else qs
+
+        if self.request.GET.get("page") == "me":
+            users = list(queryset().values_list("user", flat=True))
+            user_id = self.request.user.id
+            number = users.index(user_id) // size + 1 if user_id in users else 1
+        else:
+            number = self.int_param("page") or 1
+
+        def default():
+            page = Paginator(queryset(), size).get_page(number)
+            # Back the page with plain lists so that it caches without the queryset
+            paginator = Paginator(range(page.paginator.count), size)
+            return build(Page(list(page.object_list), page.number, paginator))
+
+        return self.cached("{}:{}:{}:{}".format(name, number, size, top or 0), scopes, default)
+
+    def get_context_data(self, **kwargs):
+        params = {key: self.request.GET[key] for key in ("size", "top") if key in self.request.GET}
+        return super().get_context_data(
+            page_params="&{}".format(urlencode(params)) if params else "", **kwargs
+        )
+
+
+class Roster(StandingsMixin, RosterMixin, PickerViewBase):
     template_name = "@roster/season.html"
 
     @property
@@ -52,11 +107,32 @@ class Roster(RosterMixin, PickerViewBase):
 
         return super().season
 
+    def get_etag_scopes(self):
+        league = self.league
+        group = self.group
+        return (
+            "roster:{}:{}".format(group.id, self.season),
+            [("standings", league.id), ("group", group.id), ("favorites", league.id)],
+        )
+
     def get_context_data(self, **kwargs):
-        roster = RosterStats.get_details(self.league, self.group, self.season)
+        league = self.league
+        group = self.group
+        season = self.season
+
+        def build(standings):
+            roster = PickerStanding.objects.roster(
+                league, group, season, entries=standings.object_list
+            )
+            return {"roster": roster, "standings": standings}
+
+        name, scopes = self.get_etag_scopes()
+        context = self.cached_standings(
+            name, scopes, lambda: PickerStanding.objects.standings(league, group, season), build
+        )
         return super().get_context_data(
-            roster=roster,
             other_groups=PickerGrouping.objects.filter(members__user=self.request.user),
+            **context,
             **kwargs,
         )
 
@@ -77,19 +153,49 @@ class RosterProfile(RosterMixin, PickerViewBase):
 #  Results
 
 
-class ResultsBase(RosterMixin, PickerViewBase):
-    pass
+class ResultsBase(StandingsMixin, RosterMixin, PickerViewBase):
+    gameset = None
+
+    def results_scopes(self, gameset):
+        # The results grid shows only the games that have started
+        started = gameset.games.games_started().count()
+        return (
+            "results:{}:{}".format(gameset.id, started),
+            [("gameset", gameset.id), ("scores", gameset.id), ("teams", gameset.league_id)],
+        )
+
+    def get_etag_scopes(self):
+        return self.results_scopes(self.gameset) if self.gameset else None
+
+    def get_results_context(self, gameset):
+        def build(standings):
+            return {
+                "standings": standings,
+                "matrix": gameset.results_matrix(standings.object_list),
+            }
+
+        name, scopes = self.results_scopes(gameset)
+        context = self.cached_standings(
+            name,
+            scopes,
+            lambda: gameset.picksets.ranked().select_related("user", "gameset"),
+            build,
+        )
+        return dict(context, gameset=gameset)
 
 
 class Results(ResultsBase):
     template_name = "@results/results.html"
 
+    @cached_property
+    def gameset(self):
+        return GameSetPicks.objects.current_gameset(league=self.league)
+
     def get(self, request, *args, **kwargs):
         context = self.get_context_data(**kwargs)
-        league = self.league
-        gameset = GameSetPicks.objects.current_gameset(league=league)
+        gameset = self.gameset
         if gameset:
-            context["gameset"] = gameset
+            context.update(self.get_results_context(gameset))
         else:
             self.template_name = "@unavailable.html"
             context["heading"] = "Results currently unavailable"
@@ -100,26 +206,50 @@ class Results(ResultsBase):
 class ResultsBySeason(ResultsBase):
     template_name = "@results/season.html"
 
-    def get_context_data(self, **kwargs):
-        return super().get_context_data(
-            gamesets=GameSetPicks.objects.filter(league=self.league, season=self.season), **kwargs
+    def get_etag_scopes(self):
+        league = self.league
+        return (
+            "season_results:{}".format(self.season),
+            [("league", league.id), ("standings", league.id)],
         )
 
+    def get_context_data(self, **kwargs):
+        league = self.league
+        season = self.season
+        name, scopes = self.get_etag_scopes()
+        gamesets = self.cached(name, scopes, lambda: self.season_winners(league, season))
+        return super().get_context_data(gamesets=gamesets, **kwargs)
+
+    @staticmethod
+    def season_winners(league, season):
+        gamesets = list(GameSetPicks.objects.filter(league=league, season=season))
+        winners = {}
+        for ps in (
+            PickSet.objects.filter(gameset__in=gamesets, gameset__points__gt=0)
+            .ranked()
+            .filter(place=1)
+            .select_related("user")
+        ):
+            winners.setdefault(ps.gameset_id, []).append(ps)
+
+        return [(gs, winners.get(gs.id, [])) for gs in gamesets]
+
 
 class ResultsByWeek(ResultsBase):
     template_name = "@results/results.html"
 
-    def get_context_data(self, **kwargs):
-        return super().get_context_data(
-            gameset=get_object_or_404(
-                GameSetPicks,
-                league=self.league,
-                season=self.season,
-                sequence=self.kwargs["sequence"],
-            ),
-            **kwargs,
+    @cached_property
+    def gameset(self):
+        return get_object_or_404(
+            GameSetPicks.objects.with_bounds(),
+            league=self.league,
+            season=self.season,
+            sequence=self.kwargs["sequence"],
         )
 
+    def get_context_data(self, **kwargs):
+        return super().get_context_data(**self.get_results_context(self.gameset), **kwargs)
+
 
 #  Picks
 
@@ -128,13 +258,11 @@ class PicksBySeason(PickerViewBase):
     template_name = "@picks/season.html"
 
     def get_context_data(self, **kwargs):
-        return super().get_context_data(
-            gamesets=[
-                (gs, gs.pick_for_user(self.request.user))
-                for gs in get_list_or_404(GameSetPicks, league=self.league, season=self.season)
-            ],
-            **kwargs,
-        )
+        gamesets = GameSetPicks.objects.season_picks(self.league, self.season, self.request.user)
+        if not gamesets:
+            raise Http404("No gamesets for season {}".format(self.season))
+
+        return super().get_context_data(gamesets=gamesets, **kwargs)
 
 
 class Picks(PickerViewBase):
@@ -161,7 +289,10 @@ class PicksByGameset(SimpleFormMixin, PickerViewBase):
     @cached_property
     def gameset(self):
         return get_object_or_404(
-            GameSetPicks, league=self.league, season=self.season, sequence=self.kwargs["sequence"]
+            GameSetPicks.objects.with_bounds(),
+            league=self.league,
+            season=self.season,
+            sequence=self.kwargs["sequence"],
         )
 
     def form_valid(self, form):
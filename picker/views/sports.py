@@ -1,4 +1,4 @@
-from django.shortcuts import get_object_or_404
+from django.http import Http404
 
 from .base import SimplePickerViewBase
 from ..models import Game
@@ -7,26 +7,70 @@ from ..models import Game
 class Team(SimplePickerViewBase):
     template_name = "@teams/detail.html"
 
+    def get_etag_scopes(self):
+        league = self.league
+        return (
+            "team:{}".format(self.kwargs.get("team")),
+            [("league", league.id), ("teams", league.id)],
+        )
+
     def get_context_data(self, **kwargs):
+        league = self.league
         team_abbr = kwargs.pop("team", None) or self.kwargs.get("team")
-        team = get_object_or_404(self.league.teams, abbr=team_abbr)
-        return super().get_context_data(team=team, **kwargs)
+
+        def team_context():
+            team = (
+                league.teams.select_related("conference", "division").filter(abbr=team_abbr).first()
+            )
+            if team is None:
+                return None
+
+            schedule = team.schedule().select_related("home", "away")
+            return {"team": team, "schedule": list(schedule)}
+
+        name, scopes = self.get_etag_scopes()
+        context = self.cached(name, scopes, team_context)
+        if context is None:
+            raise Http404("No such team")
+
+        return super().get_context_data(**context, **kwargs)
 
 
 class Teams(SimplePickerViewBase):
     template_name = "@teams/listing.html"
 
+    def get_etag_scopes(self):
+        league = self.league
+        # The listing shows each team's record, which changes with the league's results
+        return ("teams", [("league", league.id), ("teams", league.id)])
+
     def get_context_data(self, **kwargs):
-        return super().get_context_data(
-            teams=self.league.teams.select_related("conference", "division"), **kwargs
+        league = self.league
+        name, scopes = self.get_etag_scopes()
+        teams = self.cached(
+            name, scopes, lambda: list(league.teams.select_related("conference", "division"))
         )
+        return super().get_context_data(teams=teams, **kwargs)
 
 
 class Schedule(SimplePickerViewBase):
     template_name = "@schedule/season.html"
 
+    def get_etag_scopes(self):
+        league = self.league
+        return (
+            "schedule:{}".format(self.season or league.latest_season),
+            [("league", league.id), ("teams", league.id)],
+        )
+
     def get_context_data(self, **kwargs):
-        season = self.season or self.league.latest_season
+        league = self.league
+        season = self.season or league.latest_season
+        name, scopes = self.get_etag_scopes()
+        gamesets = self.cached(name, scopes, lambda: self.season_schedule(season))
+        return super().get_context_data(gamesets=gamesets, **kwargs)
+
+    def season_schedule(self, season):
         gamesets = []
         current = None
         previous = None
@@ -46,4 +90,4 @@ class Schedule(SimplePickerViewBase):
             else:
                 current[1].append(game)
 
-        return super().get_context_data(gamesets=gamesets, **kwargs)
+        return gamesets
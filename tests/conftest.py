@@ -2,11 +2,17 @@ import pytest
 from datetime import timedelta
 from picker import models as picker
 from django.utils import timezone
+from django.core.cache import cache
 from django.contrib.auth.models import User
 
 _now = timezone.now()
 
 
+@pytest.fixture(autouse=True)
+def clear_cache():
+    cache.clear()
+
+
 @pytest.fixture
 def now():
     return _now
@@ -152,3 +158,23 @@ def user_ng():
 @pytest.fixture
 def users(superuser, user, user2):
     return [superuser, user, user2]
+
+
+@pytest.fixture
+def make_picks():
+    def make_picks(gameset, picks):
+        """
+        Create a PickSet for each ``(user, winners[, points])`` in ``picks``, where
+        ``winners`` are team abbrs (or ``None``) in game order.
+        """
+        teams = gameset.league.team_dict
+        games = list(gameset.games.all())
+        for user, winners, *points in picks:
+            ps = picker.PickSet.objects.for_gameset_user(gameset, user)
+            for game, abbr in zip(games, winners):
+                ps.gamepicks.filter(game=game).update(winner=teams[abbr] if abbr else None)
+            if points:
+                ps.points = points[0]
+                ps.save()
+
+    return make_picks
@@ -0,0 +1,94 @@
+import io
+import json
+from datetime import timedelta
+
+import pytest
+from django.core.management import call_command
+from django.core.management.base import CommandError
+
+from picker import conf, feeds
+
+
+@pytest.mark.django_db
+class TestFeeds:
+    def test_active_gamesets(self, league, gameset, now):
+        assert feeds.active_gamesets(league, now) == [gameset]
+        assert feeds.active_gamesets(league, now - timedelta(hours=1)) == []
+        assert feeds.next_start(league, now - timedelta(hours=1)) == now
+
+        gameset.games.update(status="H")
+        later = now + timedelta(minutes=league.avg_game_duration + 1)
+        assert feeds.active_gamesets(league, now) == [gameset]
+        assert feeds.active_gamesets(league, later) == []
+
+        poller = feeds.ScorePoller([league])
+        assert poller.idle_delay(league, 60, 900) == 900
+
+    def test_merge_results(self, league, gameset):
+        def result(*games):
+            return {"season": gameset.season, "sequence": gameset.sequence, "games": list(games)}
+
+        first = {"home": "Hufflepuff Badgers", "away": "Gryffindor Lions", "status": "Final"}
+        second = {"home": "HUF", "away": "GRF", "status": "Q4"}
+        other = {"home": "SLY", "away": "RVN", "status": "Q1"}
+        merged = feeds.merge_results(gameset, [None, result(first), result(second, other)])
+        assert merged == result(first, other)
+        assert feeds.merge_results(gameset, [result()]) is None
+
+    def test_poll_scores(self, monkeypatch, tmp_path, league, gameset):
+        path = tmp_path / "{}-{}.json".format(gameset.season, gameset.sequence)
+        path.write_text(
+            json.dumps(
+                {
+                    "season": gameset.season,
+                    "sequence": gameset.sequence,
+                    "games": [
+                        {
+                            "home": "HUF",
+                            "away": "GRF",
+                            "home_score": 10,
+                            "away_score": 40,
+                            "status": "Final",
+                            "winner": "GRF",
+                        },
+                        {
+                            "home": "SLY",
+                            "away": "RVN",
+                            "home_score": 20,
+                            "away_score": 0,
+                            "status": "Q3",
+                        },
+                    ],
+                }
+            )
+        )
+        with pytest.raises(TypeError):
+            feeds.ScoreFeed(league)
+
+        monkeypatch.setitem(conf.picker_settings, "HQ", {})
+        with pytest.raises(CommandError, match="No score feeds for HQ"):
+            call_command("poll_scores", "--league", "hq", "--once")
+
+        monkeypatch.setitem(
+            conf.picker_settings,
+            "HQ",
+            {
+                "SCORE_FEEDS": [
+                    {
+                        "BACKEND": "picker.feeds.FileFeed",
+                        "OPTIONS": {"path": str(tmp_path / "missing.json")},
+                    },
+                    {
+                        "BACKEND": "picker.feeds.FileFeed",
+                        "OPTIONS": {"path": str(tmp_path / "{season}-{sequence}.json")},
+                    },
+                ]
+            },
+        )
+
+        out = io.StringIO()
+        call_command("poll_scores", "--league", "hq", "--once", stdout=out)
+        assert "Updated HQ {}: 1 games final".format(gameset) in out.getvalue()
+        game1, game2 = gameset.games.all()
+        assert (game1.status, game1.away_score) == ("A", 40)
+        assert (game2.status, game2.home_score) == ("U", 20)
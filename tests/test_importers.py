@@ -1,3 +1,4 @@
+import io
 import os
 import json
 
@@ -6,7 +7,7 @@ from django.urls import reverse
 from django.core.management import call_command
 
 from picker import models as picker
-from picker import importers, exceptions
+from picker import importers, exceptions, cache
 
 
 def load_json(filename):
@@ -34,6 +35,9 @@ class TestImporters:
 
     def test_management_commands(self):
         call_command("import_picks", "tests/quidditch.json")
+        out = io.StringIO()
+        call_command("import_picks", "--bulk", "tests/quidditch.json", stdout=out)
+        assert "Processed games: 0 created, 0 updated, 6 unchanged" in out.getvalue()
         data = load_json("quidditch.json")
         data["season"]["gamesets"][0].update(opens="2018-08-18T00:30Z", closes="2018-09-07T12:00Z")
         league = picker.League.get("hq")
@@ -95,3 +99,70 @@ class TestImporters:
         # /<league>/schedule/<season>/    picker.views.picks.Schedule picker-schedule-year
         r = client.get(reverse("picker-schedule-year", args=["nfl", "2019"]))
         assert r.status_code == 200
+
+    def test_bulk_import_season(self, django_assert_max_num_queries):
+        nfl_data = load_json("nfl2019.json")
+        league, created = picker.League.import_league(nfl_data["league"])[0]
+        season = nfl_data["season"]
+        report = league.import_season(season, bulk=True)
+        assert [len(v) for v in report["gamesets"].values()] == [17, 0, 0]
+        assert [len(v) for v in report["games"].values()] == [256, 0, 0]
+        assert picker.Game.objects.count() == 256
+        gs = league.gamesets.get(sequence=4)
+        assert sorted(gs.byes.values_list("abbr", flat=True)) == sorted(
+            season["gamesets"][3]["byes"]
+        )
+
+        with django_assert_max_num_queries(8):
+            report = importers.bulk_import_season(picker.League, season)
+
+        assert [len(v) for v in report["gamesets"].values()] == [0, 0, 17]
+        assert [len(v) for v in report["games"].values()] == [0, 0, 256]
+
+        item = season["gamesets"][3]
+        item["opens"] = "2019-09-24T12:00Z"
+        item["games"][0]["tv"] = "XYZ"
+        item["byes"] = item["byes"][1:]
+        other = league.gamesets.get(sequence=5)
+        scopes = [("scores", gs.id), ("gameset", gs.id), ("scores", other.id)]
+        versions = [cache.get_version(*scope) for scope in scopes]
+        report = importers.bulk_import_season(picker.League, season)
+        changed = [cache.get_version(*scope) != v for scope, v in zip(scopes, versions)]
+        assert changed == [True, True, False]
+        assert report["gamesets"]["updated"] == [gs]
+        assert [g.tv for g in report["games"]["updated"]] == ["XYZ"]
+        assert gs.byes.count() == len(item["byes"])
+        assert picker.Game.objects.filter(tv="XYZ").count() == 1
+
+    def test_bulk_import_league(self, tmp_path, django_assert_max_num_queries):
+        nfl_data = load_json("nfl2019.json")
+        (league, created), teams_info = picker.League.import_league(nfl_data["league"], bulk=True)
+        assert created is True
+        assert league.conferences.count() == 2
+        assert picker.Division.objects.count() == 8
+        assert league.teams.count() == 32
+        assert picker.Alias.objects.count() == 10
+        assert all(created for team, created in teams_info)
+        assert [t.abbr for t, c in teams_info] == [t["abbr"] for t in nfl_data["league"]["teams"]]
+        td = league.team_dict
+        assert td["WAS"] == td["WSH"]
+
+        jax = picker.Team.objects.get(league=league, nickname="Jaguars")
+        assert jax.division.conference == jax.conference
+
+        with django_assert_max_num_queries(8):
+            (league, created), teams_info = importers.bulk_import_league(
+                picker.League, nfl_data["league"]
+            )
+
+        assert created is False
+        assert not any(created for team, created in teams_info)
+
+        bundle = tmp_path / "bundle.json"
+        bundle.write_text(json.dumps([nfl_data, load_json("quidditch.json")]))
+        out = io.StringIO()
+        call_command("import_picks", "--bulk", str(bundle), stdout=out)
+        assert "Created league Hogwarts Quidditch" in out.getvalue()
+        assert picker.League.objects.count() == 2
+        assert picker.Alias.objects.count() == 10
+        assert league.gamesets.count() == 17
@@ -1,5 +1,14 @@
+import io
+from datetime import timedelta
+
 import pytest
+from django.core.management import call_command
 from django.urls import reverse
+from django.utils import timezone
+
+from picker import conf
+from picker import models as picker
+from picker.models import picks
 
 
 @pytest.mark.django_db
@@ -37,3 +46,63 @@ class TestViews:
         # /<league>/manage/game/<var>/    picker.views.manage.ManageGame  picker-manage-game
         r = client.get(reverse("picker-manage-game", args=["hq", "1"]))
         assert r.status_code == 200
+
+    def test_results_webhook(self, monkeypatch, client, league, gameset, users):
+        timers = []
+
+        class Timer:
+            def __init__(self, interval, func, args):
+                timers.append((interval, func, args))
+
+            def start(self):
+                pass
+
+        monkeypatch.setitem(conf.picker_settings["_BASE"], "RESULTS_WEBHOOK_TOKEN", "s3cret")
+        monkeypatch.setattr(picks.threading, "Timer", Timer)
+        grf = league.team_dict["GRF"]
+        for user in users:
+            ps = picker.PickSet.objects.for_gameset_user(gameset, user)
+            ps.gamepicks.filter(game__away=grf).update(winner=grf)
+
+        url = reverse("picker-results-webhook", args=["hq"])
+        game = {"home": "HUF", "away": "GRF", "home_score": 0, "away_score": 10, "status": "Q1"}
+        data = {"season": gameset.season, "sequence": gameset.sequence, "games": [game]}
+        r = client.post(url, data, content_type="application/json")
+        assert r.status_code == 403
+
+        auth = {"HTTP_AUTHORIZATION": "Bearer s3cret"}
+        r = client.post(url, [data], content_type="application/json", **auth)
+        assert r.json()["updated"][0]["finished"] == 0
+        assert timers == []
+
+        # A list is applied all or nothing
+        final = dict(game, status="Final", winner="GRF")
+        bad = {"season": gameset.season, "sequence": 99, "games": []}
+        entries = [dict(data, games=[final]), bad]
+        r = client.post(url, entries, content_type="application/json", **auth)
+        assert r.status_code == 400
+        assert not gameset.games.filter(status="A").exists()
+
+        game.update(status="Final", winner="GRF")
+        for _ in range(3):
+            r = client.post(url, data, content_type="application/json", **auth)
+            assert r.status_code == 200
+
+        assert len(timers) == 1
+        assert not picker.PickSet.objects.filter(correct__gt=0).exists()
+
+        # The timer is lost with its worker; the pending rescoring runs once overdue
+        picker.GameSet.objects.update(rescore_after=timezone.now() - timedelta(seconds=1))
+        out = io.StringIO()
+        call_command("rescore_pending", "--league", "hq", stdout=out)
+        assert "Rescored 1 gamesets" in out.getvalue()
+        assert picker.PickSet.objects.filter(correct=1).count() == 3
+
+        # A late timer finds the rescoring already claimed
+        picker.PickSet.objects.update(correct=0)
+        interval, func, args = timers[0]
+        func(*args)
+        assert not picker.PickSet.objects.filter(correct__gt=0).exists()
+
+        r = client.post(url, {"season": gameset.season}, content_type="application/json", **auth)
+        assert r.status_code == 400
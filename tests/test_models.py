@@ -1,7 +1,19 @@
+import io
+import importlib
+from datetime import timedelta
+
 import pytest
+from django.apps import apps as django_apps
+from django.contrib.auth.models import AnonymousUser
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
 
 from picker import models as picker
-from picker import forms, exceptions
+from picker import forms, exceptions, conf
+from picker.templatetags.picker_tags import season_nav
 
 from .conftest import _now
 
@@ -46,12 +58,447 @@ class TestGameSet:
         assert isinstance(str(game), str)
         assert isinstance(game.short_description, str)
 
-    def test_create_picks(self, league, gameset, user):
-        picker.PickSet.objects.for_gameset_user(gameset, user, picker.PickSet.Strategy.RANDOM)
+    def test_update_results_scores(self, league, gameset, users, django_assert_max_num_queries):
+        teams = league.team_dict
+        teams["RVN"].aliases.create(name="Ravens")
+        for user, winner in zip(users, ["GRF", "HUF", "GRF"]):
+            ps = picker.PickSet.objects.for_gameset_user(gameset, user)
+            ps.gamepicks.filter(game__home=teams["HUF"]).update(winner=teams[winner])
+
+        data = {
+            "sequence": 1,
+            "season": gameset.season,
+            "games": [
+                {"home": "HUF", "away": "GRF", "home_score": 10, "away_score": 40},
+                {"home": "SLY", "away": "Ravens", "home_score": 60, "away_score": 60},
+            ],
+        }
+        data["games"][0].update(status="Final", winner="GRF")
+        data["games"][1].update(status="Final", winner="")
+        # The first scoring builds the group's stored standings
+        with django_assert_max_num_queries(19):
+            assert gameset.update_results(data) == (2, 0)
+
+        game1, game2 = gameset.games.all()
+        assert (game1.status, game1.home_score, game1.away_score) == ("A", 10, 40)
+        assert (game2.status, game2.home_score, game2.away_score) == ("T", 60, 60)
+        picksets = picker.PickSet.objects.order_by("user__username")
+        assert [ps.correct for ps in picksets] == [1, 0, 1]
+        assert gameset.update_results(data) == (0, 0)
+
+        def correctness():
+            return list(
+                picker.GamePick.objects.order_by("pick__user__username", "game").values_list(
+                    "is_correct", flat=True
+                )
+            )
+
+        expected = [True, None, False, None, True, None]
+        assert correctness() == expected
+        picker.GamePick.objects.update(is_correct=None)
+        call_command("backfill_correctness", "--league", "hq", stdout=io.StringIO())
+        assert correctness() == expected
+
+        migration = importlib.import_module("picker.migrations.0019_backfill_gamepick_is_correct")
+        picker.GamePick.objects.update(is_correct=None)
+        migration.backfill_correctness(django_apps, None)
+        assert correctness() == expected
+
+    def test_update_scores(self, league, gameset, django_assert_num_queries):
+        games = [
+            {"home": "HUF", "away": "GRF", "home_score": 10, "away_score": 0, "status": "Q2"},
+            {"home": "SLY", "away": "RVN", "home_score": 0, "away_score": 0, "status": "Q1"},
+        ]
+        assert gameset.update_scores(games) == 1
+        scores = gameset.scores()
+        assert [(g["home"], g["home_score"], g["status"]) for g in scores["games"]] == [
+            ("HUF", 10, "Q2"),
+            ("SLY", 0, "Q1"),
+        ]
+        with django_assert_num_queries(0):
+            assert gameset.scores() == scores
+
+        games[0]["status"] = "Half"
+        assert gameset.update_scores(games) == 0
+        assert gameset.scores()["games"][0]["status"] == "Half"
+
+        games[1].update(away_score=30, status="Final", winner="RVN")
+        data = {"sequence": 1, "season": gameset.season, "games": games}
+        assert gameset.update_results(data) == (1, 0)
+        strip = gameset.scores()["games"]
+        assert [(g["away_score"], g["status"]) for g in strip] == [(0, "Half"), (30, "Final")]
+
+    def test_bounds(self, league, gameset, now, django_assert_num_queries):
+        end = now + timedelta(minutes=league.avg_game_duration)
+        with django_assert_num_queries(1):
+            gs = picker.GameSetPicks.objects.with_bounds().get(pk=gameset.pk)
+
+        with django_assert_num_queries(0):
+            assert (gs.start_time, gs.end_time) == (now, end)
+            assert (gs.has_started, gs.all_started, gs.in_progress) == (True, True, True)
+            assert not gs.is_open
+
+        with django_assert_num_queries(1):
+            assert gameset.bounds == (now, now)
+            assert gameset.end_time == end
+
+        empty = picker.GameSetPicks.objects.create(
+            league=league, season=now.year, sequence=2, opens=now, closes=now
+        )
+        assert empty.bounds == (None, None)
+        assert (empty.end_time, empty.has_started, empty.is_open) == (None, False, False)
+
+    def test_create_picks(self, league, gameset, user, django_assert_max_num_queries):
+        with django_assert_max_num_queries(10):
+            ps = picker.PickSet.objects.for_gameset_user(
+                gameset, user, picker.PickSet.Strategy.RANDOM, autopick=True
+            )
+
+        assert ps.strategy == picker.PickSet.Strategy.RANDOM
+        assert ps.progress == 2
+        for gp in ps.gamepicks.all():
+            assert gp.winner in (gp.game.home, gp.game.away)
+
+        ps.gamepicks.first().delete()
+        assert picker.PickSet.objects.for_gameset_user(gameset, user) == ps
+        assert ps.gamepicks.count() == 2
+        assert ps.progress == 1
+
+    def test_update_picks(self, league, gamesets, user, django_assert_max_num_queries):
+        teams = league.team_dict
+        gs = gamesets[1]
+        game1, game2 = gs.games.all()
+        ps = picker.PickSet.objects.for_gameset_user(gs, user)
+        with django_assert_max_num_queries(6):
+            ps.update_picks(
+                games={game1.id: str(teams["GRF"].id), game2.id: str(teams["SLY"].id)},
+                points=42,
+            )
+
+        ps.refresh_from_db()
+        assert ps.points == 42
+        assert ps.progress == 2
+
+        game1.start_time = timezone.now()
+        game1.save()
+        with django_assert_max_num_queries(5):
+            ps.update_picks(games={game1.id: teams["RVN"].id, game2.id: teams["HUF"].id})
+
+        assert dict(ps.gamepicks.picked_winner_ids()) == {
+            game1.id: teams["GRF"].id,
+            game2.id: teams["HUF"].id,
+        }
+
+        with django_assert_max_num_queries(3):
+            ps.update_picks(games={game2.id: teams["HUF"].id}, points=42)
+
+        # A game with a result before its start keeps its picks' correctness current
+        picker.Game.objects.filter(id=game2.id).update(status="H")
+        ps.update_picks(games={game2.id: teams["SLY"].id})
+        assert ps.gamepicks.get(game=game2).is_correct is True
+
+        pick = ps.gamepicks.get(game=game2)
+        pick.winner = None
+        pick.set_random_winner()
+        assert pick.is_correct == (pick.winner_id == teams["SLY"].id)
+
+    def test_autopick(self, monkeypatch, league, gamesets, users):
+        teams = league.team_dict
+        superuser, user1, user2 = users
+        gs = picker.GameSetPicks.objects.get(pk=gamesets[0].pk)
+        game1, game2 = gs.games.all()
+        ps = picker.PickSet.objects.for_gameset_user(gs, user1)
+        ps.gamepicks.filter(game=game1).update(winner=teams["GRF"])
+
+        prefs = picker.Preference.objects.get(user=user2)
+        prefs.autopick = picker.Preference.Autopick.NONE
+        prefs.save()
+
+        monkeypatch.setitem(conf.picker_settings["_BASE"], "FORCE_AUTOPICK", False)
+        Strategy = picker.PickSet.Strategy
+        assert picker.PickSet.objects.autopick(gs, Strategy.HOME) == (1, 1)
+        assert not user2.picksets.exists()
+        assert dict(ps.gamepicks.picked_winner_ids()) == {
+            game1.id: teams["GRF"].id,
+            game2.id: teams["SLY"].id,
+        }
+        auto = superuser.picksets.get()
+        assert auto.strategy == Strategy.HOME
+        assert dict(auto.gamepicks.picked_winner_ids()) == {
+            game1.id: teams["HUF"].id,
+            game2.id: teams["SLY"].id,
+        }
+
+        monkeypatch.setitem(conf.picker_settings["_BASE"], "FORCE_AUTOPICK", True)
+        call_command("autopick", "--league", "hq", "--sequence", "1", stdout=io.StringIO())
+        assert user2.picksets.get().progress == 2
+        assert picker.PickSet.objects.autopick(gs) == (0, 0)
+
+    def test_autopick_best(self, monkeypatch, league, gamesets, users, now):
+        teams = league.team_dict
+        monkeypatch.setitem(conf.picker_settings["_BASE"], "FORCE_AUTOPICK", True)
+        first, gs, last = gamesets
+        first.games.get(away=teams["GRF"]).winner = teams["GRF"]
+        last.games.get(home=teams["RVN"]).winner = teams["RVN"]
+
+        started = gs.games.get(home=teams["SLY"])
+        started.start_time = now - timedelta(hours=4)
+        started.save()
+        started.winner = teams["HUF"]
+
+        gs = picker.GameSetPicks.objects.get(pk=gs.pk)
+        assert picker.PickSet.objects.autopick(gs, picker.PickSet.Strategy.BEST) == (3, 0)
+        assert set(
+            picker.GamePick.objects.filter(game__gameset=gs).values_list("game", "winner")
+        ) == {(gs.games.get(home=teams["RVN"]).id, teams["GRF"].id)}
+
+    def test_results_matrix(self, league, gameset, users, django_assert_num_queries):
+        teams = league.team_dict
+        games = list(gameset.games.all())
+        for user in users[:2]:
+            picker.PickSet.objects.for_gameset_user(gameset, user)
+
+        ps = users[0].picksets.get()
+        ps.gamepicks.filter(game=games[0]).update(winner=teams["GRF"])
+        ps.gamepicks.filter(game=games[1]).update(winner=teams["SLY"])
+        picksets = list(gameset.picksets.select_related("user", "gameset"))
+        with django_assert_num_queries(2):
+            matrix = gameset.results_matrix(picksets)
+
+        assert list(matrix.games) == [g.id for g in games]
+        rows = dict(matrix.rows)
+        assert rows[ps] == [(games[0].id, "GRF"), (games[1].id, "SLY")]
+        other = users[1].picksets.get()
+        assert rows[other] == [(games[0].id, None), (games[1].id, None)]
+
+    def test_update_pick_status(
+        self, client, league, grouping, gameset, users, make_picks, django_assert_num_queries
+    ):
+        teams = league.team_dict
+        game1, game2 = gameset.games.all()
+        make_picks(
+            gameset,
+            [
+                (users[0], ["GRF", "RVN"], 100),
+                (users[1], ["GRF", "SLY"], 200),
+                (users[2], ["HUF", "SLY"], 300),
+            ],
+        )
+
+        game1.winner = teams["GRF"]
+        game2.winner = teams["SLY"]
+        gameset.points = 250
+        gameset.save()
+        assert gameset.update_pick_status() == 3
+
+        assert [
+            (ps.correct, ps.wrong, ps.is_winner)
+            for ps in picker.PickSet.objects.order_by("user__username")
+        ] == [(1, 1, False), (2, 0, True), (1, 1, False)]
+
+        with django_assert_num_queries(1):
+            assert gameset.update_pick_status() == 0
+
+        standings = picker.PickerStanding.objects.filter(season=gameset.season)
+        assert [(s.user, s.place, s.correct) for s in standings] == [
+            (users[1], 1, 2),
+            (users[2], 2, 1),
+            (users[0], 3, 1),
+        ]
+
+        with django_assert_num_queries(1):
+            results = [(ps.user, ps.place, ps.delta) for ps in gameset.results()]
+
+        assert results == [(users[1], 1, 50), (users[2], 2, 50), (users[0], 3, 150)]
+        assert [ps.user for ps in gameset.winners()] == [users[1]]
+
+        client.force_login(users[0])
+        url = reverse("picker-results-sequence", args=["hq", grouping.id, gameset.season, 1])
+        r = client.get(url, {"size": 2, "page": "me"})
+        assert r.context["standings"].number == 2
+        assert [ps.user for ps, picks in r.context["matrix"].rows] == [users[0]]
+        assert picker.PickSet.objects.ranked().filter(place__lte=2).count() == 2
+
+        gameset.points = 0
+        assert not gameset.winners().exists()
+        picker.PickSet.objects.update(points=0)
+        assert [ps.place for ps in gameset.results()] == [1, 2, 2]
+
+    def test_incremental_standings(self, league, grouping, gameset, users, make_picks):
+        game1, game2 = gameset.games.all()
+        make_picks(
+            gameset,
+            [
+                (users[0], ["GRF", "RVN"]),
+                (users[1], ["GRF", "SLY"]),
+                (users[2], ["HUF", "SLY"]),
+            ],
+        )
+
+        picker.Game.objects.filter(id=game1.id).update(status="A")
+        picker.Game.objects.filter(id=game2.id).update(status="H")
+        picker.GamePick.objects.update_correctness(gameset.games.all())
+        gameset.update_pick_status()
+
+        def standings():
+            return list(
+                picker.PickerStanding.objects.order_by("season", "place", "user").values_list(
+                    "season", "user", "place", "correct", "wrong"
+                )
+            )
+
+        # A late correction updates the stored rows in place
+        picker.Game.objects.filter(id=game2.id).update(status="A")
+        picker.GamePick.objects.update_correctness([picker.Game.objects.get(id=game2.id)])
+        with CaptureQueriesContext(connection) as ctx:
+            gameset.rescore_games({game2.id: ("H", "A")})
+
+        assert not [q for q in ctx if "picker_pickerstanding" in q["sql"] and "DELETE" in q["sql"]]
+        incremental = standings()
+        assert incremental[:3] == [
+            (None, users[0].id, 1, 2, 0),
+            (None, users[1].id, 2, 1, 1),
+            (None, users[2].id, 3, 0, 2),
+        ]
+        picker.PickerStanding.objects.refresh(league, gameset.season)
+        assert standings() == incremental
+
+        # Changing the picks of an unscored gameset leaves the standings alone
+        ps = picker.PickSet.objects.get(user=users[0])
+        with CaptureQueriesContext(connection) as ctx:
+            ps.update_picks(points=42)
+
+        assert not [q for q in ctx if "picker_pickerstanding" in q["sql"]]
+
+        # A new points total moves every user's points delta
+        for user, points in zip(users, [100, 200, 300]):
+            picker.PickSet.objects.filter(user=user).update(points=points)
+
+        gameset.points = 290
+        gameset.save()
+        gameset.update_pick_status(points_changed=True)
+
+        def deltas():
+            return list(
+                picker.PickerStanding.objects.order_by("season", "user").values_list(
+                    "season", "user", "place", "points_delta"
+                )
+            )
+
+        incremental = deltas()
+        assert incremental[:3] == [
+            (None, users[0].id, 1, 190),
+            (None, users[1].id, 2, 90),
+            (None, users[2].id, 3, 10),
+        ]
+        picker.PickerStanding.objects.refresh(league, gameset.season)
+        assert deltas() == incremental
+
+    def test_rescore_games(self, league, gameset, users, make_picks, django_assert_max_num_queries):
+        teams = league.team_dict
+        game1, game2 = gameset.games.all()
+        make_picks(
+            gameset,
+            [
+                (users[0], ["GRF", "RVN"], 100),
+                (users[1], ["GRF", "SLY"], 200),
+                (users[2], ["HUF", "SLY"], 300),
+            ],
+        )
+
+        game1.winner = teams["GRF"]
+        game2.winner = teams["SLY"]
+        gameset.points = 250
+        gameset.save()
+        gameset.update_pick_status()
+
+        def scores():
+            return [
+                (ps.correct, ps.wrong, ps.is_winner)
+                for ps in picker.PickSet.objects.order_by("user__username")
+            ]
+
+        # A late correction: RVN actually won game2
+        game2.winner = teams["RVN"]
+        with django_assert_max_num_queries(16):
+            assert gameset.rescore_games({game2.id: ("H", "A")}) == 3
+
+        assert scores() == [(2, 0, True), (1, 1, False), (0, 2, False)]
+        gameset.update_pick_status()
+        assert scores() == [(2, 0, True), (1, 1, False), (0, 2, False)]
+        assert gameset.rescore_games({game2.id: ("A", "A")}) == 0
+
+    def test_rescore_games_matches_full(self, league, gameset, users, make_picks):
+        game1, game2 = gameset.games.all()
+        make_picks(
+            gameset,
+            [
+                (users[0], ["GRF", "RVN"]),
+                (users[1], ["HUF", "SLY"]),
+                (users[2], [None, "SLY"]),
+            ],
+        )
+
+        def scores():
+            return [
+                (ps.correct, ps.wrong, ps.is_winner)
+                for ps in picker.PickSet.objects.order_by("user__username")
+            ]
+
+        # The first game goes final on a fresh gameset
+        data = {"sequence": 1, "season": gameset.season, "games": [dict(results["games"][0])]}
+        data["games"][0]["status"] = "Final"
+        gameset.update_results(data)
+        incremental = scores()
+        assert incremental == [(1, 1, False), (0, 2, False), (0, 2, False)]
+
+        picker.PickSet.objects.update(correct=0, wrong=0)
+        gameset.update_pick_status()
+        assert scores() == incremental
 
 
 @pytest.mark.django_db
 class TestLeague:
+    def test_team_dict(self, league, django_assert_num_queries):
+        grf = league.teams.get(abbr="GRF")
+        with django_assert_num_queries(2):
+            teams = league.team_dict
+
+        assert teams["GRF"] == teams[grf.id] == teams["Gryffindor Lions"] == grf
+        other = picker.League.objects.get(pk=league.pk)
+        with django_assert_num_queries(0):
+            assert other.team_dict.keys() == teams.keys()
+
+        grf.aliases.create(name="Lions")
+        assert picker.League.get("hq").team_dict["Lions"] == grf
+
+        # Teams are bound to the league that asked for them, never shared
+        picker.League.objects.filter(pk=league.pk).update(current_season=1999)
+        other = picker.League.objects.get(pk=league.pk)
+        team = other.team_dict["GRF"]
+        assert team is not teams["GRF"]
+        assert team.league is other
+        assert team.league.current_season == 1999
+
+    def test_season_map(self, league, gamesets, now, django_assert_num_queries):
+        with django_assert_num_queries(1):
+            seasons = league.season_map
+
+        assert [gs["id"] for gs in seasons[now.year]] == [gs.id for gs in gamesets]
+        assert league.available_seasons == [now.year]
+
+        other = picker.League.objects.get(pk=league.pk)
+        with django_assert_num_queries(0):
+            assert other.season_map == seasons
+            nav = season_nav({"user": AnonymousUser(), "league": other}, gamesets[1], "picks")
+
+        assert (nav["previous"]["id"], nav["following"]["id"]) == (gamesets[0].id, gamesets[2].id)
+        assert nav["season_gamesets"] == seasons[now.year]
+
+        league.gamesets.create(season=now.year + 1, sequence=1, opens=now, closes=now)
+        other = picker.League.objects.get(pk=league.pk)
+        assert other.available_seasons == [now.year + 1, now.year]
+
     def test_no_gamesets(self, league):
         assert league.current_gameset is None
         assert league.latest_gameset is None
@@ -67,6 +514,30 @@ class TestTeam:
         assert team.byes().count() == 0
         assert team.complete_record() == [[0, 0, 0], [0, 0, 0], [0, 0, 0]]
 
+    def test_team_records(self, client, league, gamesets, django_assert_num_queries):
+        teams = league.team_dict
+        assert league.team_records() == {}
+        for gs, winners in zip(gamesets, [["GRF", "SLY"], ["RVN", None]]):
+            for game, winner in zip(gs.games.all(), winners):
+                game.winner = teams[winner] if winner else None
+
+        records = {
+            teams["GRF"].id: (1, 1, 0),
+            teams["HUF"].id: (0, 1, 1),
+            teams["RVN"].id: (1, 1, 0),
+            teams["SLY"].id: (1, 0, 1),
+        }
+        assert league.team_records() == records
+        with django_assert_num_queries(0):
+            assert league.team_records() == records
+            assert teams["HUF"].record_as_string == "0-1-1"
+
+        assert league.team_records(league.current_season + 1) == {}
+
+        r = client.get(reverse("picker-teams", args=["hq"]))
+        assert r.status_code == 200
+        assert "1-0-1" in r.content.decode()
+
 
 @pytest.mark.django_db
 class TestUserConf:
@@ -1,5 +1,8 @@
 import pytest
+from django.db import connection
 from django.urls import reverse
+from django.test.utils import CaptureQueriesContext
+from picker import cache
 from picker import models as picker
 from picker.stats import RosterStats
 
@@ -49,6 +52,135 @@ class TestViews:
         r = client.get(url)
         assert r.status_code == 200
 
+    def test_cached_views(self, client, league, grouping, gamesets, user):
+        client.force_login(user)
+        schedule_url = reverse("picker-schedule", args=["hq"])
+        with CaptureQueriesContext(connection) as miss:
+            client.get(schedule_url)
+
+        with CaptureQueriesContext(connection) as hit:
+            r = client.get(schedule_url)
+
+        assert len(hit) < len(miss)
+        game = r.context["gamesets"][0][1][0]
+        game.location = "Quidditch Pitch"
+        game.save()
+        r = client.get(schedule_url)
+        assert r.context["gamesets"][0][1][0].location == "Quidditch Pitch"
+
+        team = league.teams.get(abbr="GRF")
+        team.nickname = "Cubs"
+        team.save()
+        r = client.get(reverse("picker-teams", args=["hq"]))
+        assert "Cubs" in [t.nickname for t in r.context["teams"]]
+
+        url = reverse("picker-results-sequence", args=["hq", grouping.id, YEAR, 1])
+        r = client.get(url)
+        assert r.context["standings"].paginator.count == 0
+        picker.PickSet.objects.for_gameset_user(gamesets[0], user)
+        r = client.get(url)
+        assert r.context["standings"].paginator.count == 1
+
+    def test_conditional_get(self, client, league, gamesets, user):
+        client.force_login(user)
+        url = reverse("picker-schedule", args=["hq"])
+        r = client.get(url)
+        etag = r["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        game = gamesets[0].games.first()
+        game.location = "Quidditch Pitch"
+        game.save()
+        r = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 200
+        assert r["ETag"] != etag
+
+        picker.Preference.objects.for_user(user).save()
+        assert client.get(url, HTTP_IF_NONE_MATCH=r["ETag"]).status_code == 200
+        assert "ETag" not in client.get(reverse("picker-picks", args=["hq"]))
+
+    def test_conditional_get_scopes(self, client, league, grouping, gamesets, users, now):
+        user1, user2 = users[1:]
+        client.force_login(user1)
+        teams_url = reverse("picker-teams", args=["hq"])
+        etag = client.get(teams_url)["ETag"]
+        game = gamesets[0].games.first()
+        game.winner = game.home
+        assert client.get(teams_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+        url = reverse("picker-roster-group", args=["hq", grouping.id])
+        client.get(url)  # builds the stored standings
+        etag = client.get(url)["ETag"]
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 304
+
+        # Another member's favorite shows on the roster
+        grf = league.teams.get(abbr="GRF")
+        picker.PickerFavorite.objects.create(user=user2, league=league, team=grf)
+        r = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert r.status_code == 200
+
+        # A new gameset shows in the season navigation
+        etag = r["ETag"]
+        league.gamesets.create(season=now.year, sequence=4, opens=now, closes=now)
+        assert client.get(url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+        # Saving a gameset through the proxy model invalidates its results page
+        results_url = reverse("picker-results-sequence", args=["hq", grouping.id, YEAR, 1])
+        etag = client.get(results_url)["ETag"]
+        version = cache.get_version("gameset", gamesets[0].pk)
+        gameset = picker.GameSetPicks.objects.get(pk=gamesets[0].pk)
+        gameset.points = 260
+        gameset.save()
+        assert cache.get_version("gameset", gameset.pk) != version
+        assert client.get(results_url, HTTP_IF_NONE_MATCH=etag).status_code == 200
+
+    def test_picker_context(self, client, league, grouping, gamesets, user):
+        client.force_login(user)
+        url = reverse("picker-picks-season", args=["hq", str(YEAR)])
+        r = client.get(url)
+        assert r.context["memberships"][0].group == grouping
+        assert r.context["picker"].favorite(user) is None
+
+        with CaptureQueriesContext(connection) as ctx:
+            client.get(url)
+
+        assert not [q for q in ctx if "picker_preference" in q["sql"]]
+
+        grf = league.teams.get(abbr="GRF")
+        picker.PickerFavorite.objects.create(user=user, league=league, team=grf)
+        r = client.get(url)
+        assert r.context["picker"].favorite(user) == grf
+
+        user.picker_memberships.all().delete()
+        r = client.get(url)
+        assert r.context["memberships"] == []
+
+    def test_season_picks(self, league, gamesets, user, django_assert_num_queries):
+        grf = league.teams.get(abbr="GRF")
+        ps = picker.PickSet.objects.for_gameset_user(gamesets[0], user, autopick=True)
+        ps.points = 100
+        ps.save()
+        picker.PickSet.objects.for_gameset_user(gamesets[1], user)
+
+        with django_assert_num_queries(1):
+            results = picker.GameSetPicks.objects.season_picks(league, YEAR, user)
+            status = [
+                (gs.is_open, pick and (pick.is_complete, pick.progress)) for gs, pick in results
+            ]
+
+        assert [gs for gs, pick in results] == list(gamesets)
+        expected = []
+        for gs in picker.GameSetPicks.objects.filter(league=league, season=YEAR):
+            pick = gs.pick_for_user(user)
+            expected.append((gs.is_open, pick and (pick.is_complete, pick.progress)))
+
+        assert status == expected
+        assert status[0][1] == (True, 2)
+
+        ps.gamepicks.filter(game__away=grf).update(winner=None)
+        gs, pick = picker.GameSetPicks.objects.season_picks(league, YEAR, user)[0]
+        assert (pick.is_complete, pick.progress) == (False, 1)
+
 
 @pytest.mark.django_db
 class TestPicksForm:
@@ -1,6 +1,9 @@
 import pytest
 from django.urls import reverse
 
+from picker import models as picker
+from picker.stats import RosterStats
+
 
 @pytest.mark.django_db
 class TestViews:
@@ -35,3 +38,68 @@ class TestViews:
             print("url =", url)
             r = client.get(url)
             assert r.status_code == code
+
+
+@pytest.mark.django_db
+class TestRosterStats:
+    def test_get_details(self, league, grouping, gamesets, users, django_assert_num_queries):
+        superuser, user1, user2 = users
+        gs1, gs2 = gamesets[:2]
+        gs1.points = 100
+        gs1.save()
+        for gs, user, correct, wrong, points, is_winner in [
+            (gs1, user1, 2, 0, 90, True),
+            (gs1, user2, 1, 1, 120, False),
+            (gs2, user1, 0, 2, 0, False),
+        ]:
+            picker.PickSet.objects.create(
+                gameset=gs,
+                user=user,
+                correct=correct,
+                wrong=wrong,
+                points=points,
+                is_winner=is_winner,
+            )
+
+        with django_assert_num_queries(3):
+            details = RosterStats.get_details(league, grouping)
+
+        assert [(e.user, e.place, a.place) for e, a in details] == [
+            (user1, 1, 1),
+            (user2, 2, 2),
+            (superuser, 3, 3),
+        ]
+        season, all_time = details[0]
+        assert (season.correct, season.wrong, season.points_delta) == (2, 2, 10)
+        assert (season.picksets_played, season.picksets_won) == (2, 1)
+        assert season.avg_points_delta == 5
+
+        rs = RosterStats(user2, league, league.current_season)
+        assert (rs.correct, rs.wrong, rs.points_delta, rs.pct) == (1, 1, 20, 50.0)
+
+    def test_standings(self, client, league, grouping, gamesets, users):
+        superuser, user1, user2 = users
+        picker.PickSet.objects.create(gameset=gamesets[0], user=user2, correct=2)
+        roster = picker.PickerStanding.objects.roster(league, grouping, league.current_season)
+        assert [(e.user, e.place, a.place) for e, a in roster] == [
+            (user2, 1, 1),
+            (superuser, 2, 2),
+            (user1, 2, 2),
+        ]
+        assert picker.PickerStanding.objects.count() == 6
+
+        picker.PickerMembership.objects.filter(user=superuser).delete()
+        assert picker.PickerStanding.objects.count() == 0
+
+        client.force_login(user1)
+        r = client.get(reverse("picker-roster-group", args=["hq", grouping.id]))
+        assert r.status_code == 200
+        assert [e.user for e, a in r.context["roster"]] == [user2, user1]
+
+        url = reverse("picker-roster-group", args=["hq", grouping.id])
+        r = client.get(url, {"size": 1, "page": "me"})
+        assert r.context["standings"].number == 2
+        assert [e.user for e, a in r.context["roster"]] == [user1]
+
+        r = client.get(url, {"top": 1})
+        assert [e.user for e, a in r.context["roster"]] == [user2]